@@ -5,29 +5,52 @@ import conf.afdx
 from exporter.buffer import BufferGraph, BufferCSV
 from exporter.flow import FlowCSV
 from tools.bufdim import BufDim
-from tools.fa import FA
+from tools.fa import MultiFA
+from tools.parallel import compute_all
+import tools.checkpoint
 import tools.fa as fa_
 import exporter.base as exporter_
+import util.trace
 import resource
 
 # Choice of a network configuration file from conf folder
 CONF_NAME = 'fpfifo'
-config = conf.afdx.Configuration.from_mod_file(CONF_NAME, latency=16)
+# Worker processes for the independent parts of the network and for figures
+JOBS = None
+# Threads sharing the results of each analysis (free-threaded Python)
+THREADS = 1
+# Chrome trace file of the analysis phases, or None not to trace
+TRACE = None
+# Checkpoint file to resume an interrupted analysis (sequential), or None
+CHECKPOINT = None
 
-# Select several analysis tools
-fa = FA(config, serialization=False, prio=True)
-fas = FA(config, serialization=True, prio=True)
-bd = BufDim(config, fas, serialization=True)
 
-# Log output as CSV or TikZ figures
-config.register(BufferCSV, timestamp=False)
-config.register(FlowCSV, timestamp=False)
-config.register(BufferGraph, timestamp=False)
+def analyses(config):
+    """Select several analysis tools, in computation order."""
+    fas = MultiFA(config, [(False, True), (True, True)])
+    bd = BufDim(config, fas[True, True], serialization=True)
+    return fas, bd
 
-# Run each analysis
-fa.compute_all()
-fas.compute_all()
-bd.compute_all()
 
-# Render logs to the export folder
-config.render_all()
+if __name__ == '__main__':
+    if TRACE:
+        util.trace.enable()
+
+    config = conf.afdx.Configuration.from_mod_file(CONF_NAME, latency=16)
+
+    # Log output as CSV or TikZ figures
+    config.register(BufferCSV, timestamp=False)
+    config.register(FlowCSV, timestamp=False)
+    config.register(BufferGraph, timestamp=False, jobs=JOBS)
+
+    # Run each analysis
+    if CHECKPOINT:
+        tools.checkpoint.compute_all(config, analyses, CHECKPOINT)
+    else:
+        compute_all(config, analyses, JOBS, THREADS)
+
+    # Render logs to the export folder
+    config.render_all()
+
+    if TRACE:
+        util.trace.disable(TRACE)
@@ -0,0 +1,177 @@
+12
+ES1 1
+  1 100
+ES2 1
+  1 100
+ES3 1
+  1 100
+ES4 1
+  1 100
+ES5 1
+  1 100
+ES6 1
+  1 100
+ES7 1
+  1 100
+ES8 1
+  1 100
+ES9 1
+  1 100
+ES10 1
+  1 100
+ES11 1
+  1 100
+ES12 1
+  1 100
+6
+S1 4
+  1 100
+  2 100
+  3 100
+  4 100
+S2 4
+  1 100
+  2 100
+  3 100
+  4 100
+S3 4
+  1 100
+  2 100
+  3 100
+  4 100
+S4 4
+  1 100
+  2 100
+  3 100
+  4 100
+S5 4
+  1 100
+  2 100
+  3 100
+  4 100
+S6 4
+  1 100
+  2 100
+  3 100
+  4 100
+60
+1 10000 125 1000 1
+1 ES9 1 1 S4 3 0
+2 5000 125 125 0
+1 ES12 1 1 S4 4 0
+3 5000 250 250 2
+1 ES2 1 1 S2 2 0
+4 2500 125 250 2
+1 ES11 1 1 S3 1 1 S4 2 0
+5 2500 125 125 0
+1 ES12 1 1 S2 2 1 S3 1 0
+6 10000 125 125 0
+1 ES1 1 1 S5 2 0
+7 2500 125 125 0
+1 ES12 1 1 S1 4 1 S4 1 1 S6 3 0
+8 10000 125 250 2
+1 ES8 1 1 S1 4 1 S4 4 0
+9 625 125 250 0
+1 ES11 1 1 S2 3 1 S3 4 1 S4 4 0
+10 10000 1500 1500 2
+1 ES6 1 2 S4 2 1 S5 4 0 S4 3 0
+11 2500 125 250 2
+1 ES8 1 2 S4 1 1 S6 1 0 S4 2 1 S6 2 0
+12 10000 1500 1500 2
+1 ES10 1 1 S1 4 1 S5 1 0
+13 10000 125 250 2
+1 ES3 1 2 S1 4 1 S3 1 0 S1 1 0
+14 10000 125 1000 0
+1 ES5 1 1 S4 3 1 S6 1 0
+15 5000 125 500 1
+1 ES10 1 1 S1 3 1 S6 3 0
+16 5000 125 1000 1
+1 ES2 1 1 S4 1 1 S5 3 1 S6 3 0
+17 10000 125 125 2
+1 ES8 1 2 S4 3 1 S5 4 1 S6 3 0 S4 2 0
+18 10000 125 1500 1
+1 ES2 1 1 S3 3 1 S4 4 1 S5 1 0
+19 5000 125 125 1
+1 ES3 1 2 S2 3 1 S3 1 1 S6 1 0 S2 4 0
+20 2500 500 500 1
+1 ES7 1 1 S5 1 1 S6 2 0
+21 625 125 125 1
+1 ES7 1 2 S1 4 1 S2 4 0 S1 1 1 S6 2 0
+22 5000 125 125 0
+1 ES7 1 1 S4 1 1 S6 3 0
+23 5000 125 125 0
+1 ES8 1 1 S3 2 1 S6 4 0
+24 2500 125 125 1
+1 ES2 1 1 S5 2 1 S6 1 0
+25 5000 125 500 2
+1 ES4 1 1 S2 4 1 S5 3 1 S6 3 0
+26 2500 125 1000 0
+1 ES4 1 1 S3 2 0
+27 5000 500 500 2
+1 ES1 1 1 S2 4 1 S3 2 1 S6 4 0
+28 5000 125 1000 1
+1 ES5 1 1 S4 2 0
+29 10000 125 125 0
+1 ES5 1 2 S1 4 1 S4 1 0 S1 3 1 S3 4 0
+30 10000 125 125 0
+1 ES9 1 1 S4 1 1 S5 1 1 S6 4 0
+31 5000 125 500 2
+1 ES2 1 1 S1 3 1 S4 1 1 S5 2 0
+32 10000 125 125 1
+1 ES3 1 1 S4 2 1 S6 4 0
+33 5000 125 250 2
+1 ES5 1 1 S2 4 1 S5 4 1 S6 4 0
+34 5000 500 500 1
+1 ES5 1 1 S1 2 1 S3 3 1 S4 3 0
+35 5000 500 500 1
+1 ES8 1 1 S3 1 1 S6 1 0
+36 5000 125 250 0
+1 ES10 1 1 S1 4 1 S4 1 0
+37 2500 125 250 2
+1 ES5 1 1 S3 3 1 S5 2 1 S6 3 0
+38 2500 250 250 1
+1 ES10 1 1 S5 4 0
+39 10000 1000 1000 0
+1 ES1 1 1 S2 4 1 S3 4 0
+40 10000 250 250 2
+1 ES2 1 1 S1 3 1 S4 3 0
+41 5000 125 125 2
+1 ES8 1 1 S5 4 1 S6 2 0
+42 10000 125 1000 2
+1 ES8 1 1 S5 2 1 S6 4 0
+43 10000 1000 1000 1
+1 ES7 1 1 S1 2 1 S6 1 0
+44 10000 500 500 0
+1 ES11 1 1 S3 4 1 S5 3 0
+45 10000 125 125 0
+1 ES7 1 2 S1 1 1 S4 3 1 S5 1 0 S1 3 0
+46 10000 125 125 0
+1 ES2 1 2 S2 4 0 S2 2 0
+47 5000 125 125 2
+1 ES1 1 1 S3 2 0
+48 10000 125 500 1
+1 ES6 1 1 S5 4 0
+49 10000 125 125 2
+1 ES7 1 1 S1 4 1 S5 4 1 S6 2 0
+50 5000 500 500 1
+1 ES8 1 1 S5 2 0
+51 10000 125 125 0
+1 ES10 1 2 S1 1 0 S1 2 0
+52 10000 125 500 2
+1 ES7 1 1 S3 1 1 S6 1 0
+53 5000 1000 1000 2
+1 ES6 1 1 S5 3 1 S6 4 0
+54 2500 125 125 0
+1 ES12 1 1 S5 4 1 S6 1 0
+55 10000 250 250 1
+1 ES12 1 1 S5 2 0
+56 2500 125 125 0
+1 ES4 1 2 S1 4 1 S6 2 0 S1 2 1 S2 2 0
+57 10000 125 125 1
+1 ES5 1 2 S4 1 0 S4 2 1 S5 2 1 S6 4 0
+58 5000 125 125 1
+1 ES10 1 1 S5 3 0
+59 2500 125 125 1
+1 ES12 1 1 S5 2 0
+60 5000 125 125 2
+1 ES1 1 1 S3 1 0
@@ -0,0 +1,313 @@
+30
+ES1 1
+  1 100
+ES2 1
+  1 100
+ES3 1
+  1 100
+ES4 1
+  1 100
+ES5 1
+  1 100
+ES6 1
+  1 100
+ES7 1
+  1 100
+ES8 1
+  1 100
+ES9 1
+  1 100
+ES10 1
+  1 100
+ES11 1
+  1 100
+ES12 1
+  1 100
+ES13 1
+  1 100
+ES14 1
+  1 100
+ES15 1
+  1 100
+ES16 1
+  1 100
+ES17 1
+  1 100
+ES18 1
+  1 100
+ES19 1
+  1 100
+ES20 1
+  1 100
+ES21 1
+  1 100
+ES22 1
+  1 100
+ES23 1
+  1 100
+ES24 1
+  1 100
+ES25 1
+  1 100
+ES26 1
+  1 100
+ES27 1
+  1 100
+ES28 1
+  1 100
+ES29 1
+  1 100
+ES30 1
+  1 100
+10
+S1 4
+  1 100
+  2 100
+  3 100
+  4 100
+S2 4
+  1 100
+  2 100
+  3 100
+  4 100
+S3 4
+  1 100
+  2 100
+  3 100
+  4 100
+S4 4
+  1 100
+  2 100
+  3 100
+  4 100
+S5 4
+  1 100
+  2 100
+  3 100
+  4 100
+S6 4
+  1 100
+  2 100
+  3 100
+  4 100
+S7 4
+  1 100
+  2 100
+  3 100
+  4 100
+S8 4
+  1 100
+  2 100
+  3 100
+  4 100
+S9 4
+  1 100
+  2 100
+  3 100
+  4 100
+S10 4
+  1 100
+  2 100
+  3 100
+  4 100
+100
+1 2500 125 1500 1
+1 ES4 1 2 S8 4 1 S9 1 1 S10 4 0 S8 1 1 S10 2 0
+2 625 250 250 0
+1 ES22 1 2 S4 3 0 S4 4 0
+3 625 125 125 2
+1 ES24 1 1 S5 3 0
+4 10000 125 1500 0
+1 ES17 1 1 S7 4 0
+5 2500 125 250 0
+1 ES25 1 1 S4 4 1 S9 3 1 S10 1 0
+6 10000 125 1500 2
+1 ES25 1 1 S9 4 0
+7 10000 500 500 0
+1 ES9 1 2 S2 2 0 S2 4 0
+8 1250 125 250 1
+1 ES5 1 1 S1 4 0
+9 5000 125 250 0
+1 ES10 1 1 S2 3 0
+10 5000 250 250 2
+1 ES9 1 1 S3 1 1 S5 4 1 S10 1 0
+11 5000 1500 1500 0
+1 ES11 1 1 S7 1 1 S9 2 1 S10 3 0
+12 5000 500 500 0
+1 ES10 1 1 S4 2 1 S5 3 1 S6 4 0
+13 5000 125 500 1
+1 ES29 1 1 S5 1 0
+14 2500 125 125 1
+1 ES26 1 1 S9 3 0
+15 1250 125 125 2
+1 ES20 1 1 S6 4 1 S7 1 0
+16 625 250 250 0
+1 ES8 1 1 S6 3 1 S10 1 0
+17 2500 125 500 2
+1 ES15 1 1 S7 4 0
+18 625 125 125 2
+1 ES12 1 1 S3 2 1 S10 3 0
+19 10000 250 250 1
+1 ES14 1 1 S2 4 1 S4 1 1 S10 1 0
+20 2500 125 125 2
+1 ES1 1 1 S4 4 0
+21 2500 250 250 1
+1 ES18 1 1 S7 4 0
+22 5000 125 1000 0
+1 ES3 1 1 S1 1 0
+23 5000 1000 1000 0
+1 ES13 1 1 S3 1 1 S5 1 1 S8 2 0
+24 10000 125 125 0
+1 ES16 1 1 S3 2 1 S7 3 1 S9 2 0
+25 1250 125 500 1
+1 ES6 1 1 S2 1 0
+26 10000 125 1000 2
+1 ES17 1 1 S5 3 0
+27 1250 125 250 2
+1 ES28 1 1 S7 3 0
+28 1250 125 125 1
+1 ES15 1 1 S5 4 0
+29 2500 1000 1000 2
+1 ES14 1 1 S2 2 1 S5 2 0
+30 10000 125 250 1
+1 ES7 1 1 S7 2 0
+31 5000 125 125 0
+1 ES23 1 1 S5 1 1 S6 2 1 S8 2 0
+32 1250 125 125 2
+1 ES17 1 2 S6 3 0 S6 2 0
+33 5000 125 125 1
+1 ES29 1 2 S4 2 1 S6 1 1 S9 2 0 S4 4 0
+34 2500 125 250 1
+1 ES14 1 1 S2 1 0
+35 10000 125 125 2
+1 ES19 1 2 S2 4 1 S3 1 0 S2 3 1 S5 1 1 S9 2 0
+36 10000 500 500 1
+1 ES9 1 1 S8 2 1 S9 4 0
+37 10000 250 250 2
+1 ES18 1 1 S6 1 1 S7 4 0
+38 5000 125 500 2
+1 ES12 1 2 S2 1 0 S2 4 1 S3 2 0
+39 5000 125 250 2
+1 ES5 1 2 S2 3 0 S2 4 0
+40 5000 500 500 0
+1 ES23 1 1 S2 3 0
+41 10000 1500 1500 2
+1 ES26 1 1 S2 2 0
+42 10000 125 125 2
+1 ES21 1 2 S7 3 1 S9 2 0 S7 4 0
+43 5000 125 500 2
+1 ES25 1 2 S1 4 0 S1 2 1 S5 4 0
+44 5000 125 125 0
+1 ES25 1 2 S5 3 1 S7 3 1 S9 4 0 S5 4 0
+45 5000 125 125 1
+1 ES16 1 1 S3 1 0
+46 2500 125 125 1
+1 ES24 1 1 S1 1 1 S10 3 0
+47 2500 125 250 1
+1 ES29 1 1 S2 3 0
+48 10000 125 125 0
+1 ES27 1 2 S8 2 1 S9 2 1 S10 3 0 S8 3 0
+49 1250 250 250 2
+1 ES19 1 1 S1 1 0
+50 10000 1500 1500 0
+1 ES17 1 1 S6 4 0
+51 5000 125 250 0
+1 ES5 1 1 S4 2 1 S6 1 0
+52 10000 125 125 2
+1 ES2 1 1 S8 2 0
+53 5000 125 250 2
+1 ES2 1 1 S2 4 0
+54 5000 1000 1000 2
+1 ES25 1 1 S3 4 1 S6 2 1 S9 4 0
+55 2500 125 500 1
+1 ES1 1 1 S6 4 0
+56 2500 125 125 2
+1 ES17 1 2 S3 2 0 S3 3 1 S4 3 0
+57 2500 250 250 2
+1 ES16 1 1 S1 2 1 S4 2 1 S6 3 0
+58 5000 125 125 1
+1 ES1 1 1 S9 2 0
+59 10000 125 125 1
+1 ES28 1 2 S5 2 1 S7 4 0 S5 4 1 S10 3 0
+60 5000 125 125 2
+1 ES17 1 1 S1 1 1 S7 4 1 S9 3 0
+61 10000 125 125 2
+1 ES24 1 2 S3 4 0 S3 2 1 S7 1 1 S8 2 0
+62 2500 125 500 1
+1 ES20 1 1 S4 2 1 S7 3 0
+63 10000 250 250 2
+1 ES9 1 1 S8 2 0
+64 5000 250 250 2
+1 ES2 1 2 S3 4 0 S3 2 0
+65 10000 500 500 2
+1 ES22 1 2 S1 4 0 S1 3 1 S8 2 1 S9 4 0
+66 1250 125 125 0
+1 ES15 1 1 S4 1 1 S5 1 0
+67 2500 500 500 2
+1 ES26 1 1 S3 1 0
+68 10000 125 125 0
+1 ES17 1 1 S5 2 0
+69 2500 250 250 0
+1 ES26 1 2 S7 2 1 S8 3 1 S9 2 0 S7 3 0
+70 10000 125 500 1
+1 ES26 1 1 S1 2 0
+71 10000 125 500 1
+1 ES6 1 1 S4 2 0
+72 5000 500 500 1
+1 ES20 1 1 S4 3 0
+73 5000 125 125 0
+1 ES15 1 1 S5 3 1 S6 4 0
+74 10000 125 125 2
+1 ES7 1 1 S2 4 1 S5 2 1 S8 3 0
+75 5000 250 250 1
+1 ES7 1 1 S1 1 0
+76 2500 125 125 1
+1 ES12 1 1 S1 1 1 S9 4 0
+77 625 125 125 2
+1 ES3 1 1 S1 3 1 S7 2 1 S9 3 0
+78 10000 125 250 2
+1 ES15 1 2 S7 4 0 S7 2 0
+79 1250 125 125 2
+1 ES11 1 1 S5 3 0
+80 10000 125 250 0
+1 ES10 1 1 S1 2 0
+81 10000 125 125 1
+1 ES16 1 1 S9 3 1 S10 1 0
+82 10000 125 1000 1
+1 ES9 1 2 S3 1 0 S3 2 1 S5 1 0
+83 5000 500 500 0
+1 ES12 1 1 S7 2 0
+84 10000 125 125 2
+1 ES1 1 1 S7 2 1 S8 3 0
+85 2500 125 125 1
+1 ES6 1 2 S5 2 0 S5 4 0
+86 2500 125 125 0
+1 ES21 1 1 S7 2 0
+87 10000 1000 1000 0
+1 ES23 1 1 S4 1 1 S6 1 0
+88 10000 250 250 0
+1 ES21 1 2 S5 1 1 S8 3 1 S9 2 0 S5 4 0
+89 2500 125 250 1
+1 ES12 1 1 S3 3 0
+90 10000 250 250 2
+1 ES18 1 1 S4 1 0
+91 5000 125 125 1
+1 ES23 1 1 S1 3 1 S7 2 0
+92 10000 125 125 0
+1 ES10 1 2 S1 2 1 S5 2 0 S1 4 1 S4 2 1 S5 3 0
+93 5000 125 125 2
+1 ES2 1 1 S3 3 1 S10 3 0
+94 10000 125 125 2
+1 ES1 1 1 S3 1 1 S8 2 0
+95 10000 125 125 1
+1 ES11 1 1 S3 2 1 S5 2 1 S6 1 0
+96 5000 125 125 0
+1 ES1 1 1 S7 3 0
+97 2500 125 1000 1
+1 ES7 1 1 S8 3 0
+98 2500 250 250 1
+1 ES21 1 1 S3 4 0
+99 10000 500 500 2
+1 ES29 1 1 S7 2 0
+100 10000 1000 1000 1
+1 ES3 1 1 S8 2 0
@@ -0,0 +1,71 @@
+6
+ES1 1
+  1 100
+ES2 1
+  1 100
+ES3 1
+  1 100
+ES4 1
+  1 100
+ES5 1
+  1 100
+ES6 1
+  1 100
+4
+S1 3
+  1 100
+  2 100
+  3 100
+S2 3
+  1 100
+  2 100
+  3 100
+S3 3
+  1 100
+  2 100
+  3 100
+S4 3
+  1 100
+  2 100
+  3 100
+20
+1 10000 1500 1500 2
+1 ES4 1 2 S3 1 0 S3 2 1 S4 2 0
+2 10000 125 1500 2
+1 ES2 1 1 S1 1 1 S2 1 1 S4 3 0
+3 625 250 250 1
+1 ES6 1 2 S3 3 1 S4 1 0 S3 2 0
+4 10000 125 1500 1
+1 ES3 1 2 S2 3 0 S2 2 1 S4 2 0
+5 2500 125 500 2
+1 ES3 1 2 S2 2 0 S2 3 0
+6 5000 125 125 2
+1 ES1 1 1 S1 2 1 S4 1 0
+7 625 250 250 0
+1 ES2 1 2 S1 3 0 S1 1 1 S2 1 1 S3 1 0
+8 1250 125 125 2
+1 ES1 1 1 S2 1 0
+9 625 125 125 2
+1 ES1 1 1 S1 1 1 S4 3 0
+10 1250 500 500 1
+1 ES1 1 1 S2 3 0
+11 10000 1500 1500 0
+1 ES3 1 1 S2 3 0
+12 2500 125 250 1
+1 ES6 1 1 S1 1 1 S3 1 1 S4 3 0
+13 5000 125 500 0
+1 ES4 1 1 S1 3 1 S4 2 0
+14 1250 125 125 0
+1 ES6 1 1 S3 2 1 S4 1 0
+15 10000 1000 1000 1
+1 ES2 1 1 S1 3 1 S3 3 1 S4 3 0
+16 1250 125 125 0
+1 ES5 1 2 S1 1 0 S1 3 0
+17 5000 125 1500 2
+1 ES5 1 1 S2 1 1 S3 2 0
+18 5000 125 1500 1
+1 ES4 1 1 S3 3 1 S4 2 0
+19 1250 125 250 1
+1 ES6 1 1 S2 2 1 S4 3 0
+20 2500 125 125 1
+1 ES2 1 1 S3 1 0
@@ -0,0 +1,30 @@
+3
+ES1 1
+  1 100
+ES2 1
+  1 100
+ES3 1
+  1 100
+3
+S1 2
+  1 100
+  2 100
+S2 2
+  1 100
+  2 100
+S3 2
+  1 100
+  2 100
+6
+1 4000 125 500 0
+1 ES1 1 1 S1 1 1 S2 1 1 S3 2 0
+2 4000 125 500 0
+1 ES2 1 1 S2 1 1 S3 1 1 S1 2 0
+3 4000 125 500 0
+1 ES3 1 1 S3 1 1 S1 1 1 S2 2 0
+4 2500 125 250 1
+1 ES1 1 1 S1 1 1 S2 1 1 S3 2 0
+5 2500 125 250 1
+1 ES2 1 1 S2 1 1 S3 1 1 S1 2 0
+6 2500 125 250 1
+1 ES3 1 1 S3 1 1 S1 1 1 S2 2 0
@@ -0,0 +1,228 @@
+"""Analyse many network configurations, and summarize the results as JSON.
+
+    python batch.py 'assets/gen*.mod' assets/fifo.mod -a fa-p fa-sp bd-s -j 8
+
+VL deadlines are read from the .dl file next to each .mod file, if any.
+"""
+
+import sys
+import json
+import time
+import signal
+import argparse
+from glob import glob
+from pathlib import Path
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+import conf.afdx
+from exporter.summary import Summary
+from tools.bufdim import BufDim
+from tools.fa import FA
+from tools.sim import Sim
+from tools.rbf import Overload, load
+
+# Analysis variants: FA (serialization, prio) or BufDim serialization
+FA_VARIANTS = {
+    'fa': (False, False),
+    'fa-s': (True, False),
+    'fa-p': (False, True),
+    'fa-sp': (True, True),
+}
+BUFDIM_VARIANTS = {
+    'bd': False,
+    'bd-s': True,
+}
+# Simulation variants: Sim prio
+SIM_VARIANTS = {
+    'sim': False,
+    'sim-p': True,
+}
+
+
+def build(config, variants):
+    """Analysis tools for variants, in order. BufDim variants rely on the
+    last FA variant before them."""
+    tools, fa = [], None
+    for variant in variants:
+        if variant in FA_VARIANTS:
+            fa = FA(config, *FA_VARIANTS[variant])
+            tools.append(fa)
+        elif variant in SIM_VARIANTS:
+            tools.append(Sim(config, SIM_VARIANTS[variant]))
+        else:
+            tools.append(BufDim(config, fa, BUFDIM_VARIANTS[variant]))
+    return tools
+
+
+def check_load(nodes):
+    """Raise Overload if the load of a port is not below 1, before any
+    analysis."""
+    for node in nodes:
+        U = load((flow.C(node), flow.T, 0.0) for flow in node)
+        if U >= 1.0:
+            raise Overload(f'Load {U:.4g} is not below 1 in {node}')
+
+
+def read_config(path, latency=16):
+    """Configuration of a .mod file, with the VL deadlines read from the
+    .dl file next to it, if any."""
+    config = conf.afdx.Configuration.from_mod_file(
+        Path(path).stem, latency, path=path)
+    if Path(path).with_suffix('.dl').exists():
+        config.read_deadlines(Path(path).with_suffix('.dl'))
+    return config
+
+
+def timeout(signum, frame):
+    raise TimeoutError('Analysis timed out')
+
+
+def admission(tool):
+    """Admission check of a tool, as a dict."""
+    admitted, flow, node, delay = tool.admit()
+    return {'admitted': admitted,
+            'vl': flow and flow._model.num,
+            'port': node and node._model.port_id,
+            'delay': delay}
+
+
+def summarize(config):
+    """Register a summary of the results of config, and return a function
+    adding it to the result of its analysis."""
+    config.register(Summary)
+    summary = config.exporters[-1]
+
+    def report(result):
+        results = summary.as_dict()
+        result['vls'], result['ports'] = results['flows'], results['nodes']
+    return report
+
+
+def analyse(variants, latency, path, limit=None, admit=False, threads=1,
+            ports=None, collect=summarize):
+    """Summary of the analysis of one configuration file, or of some of its
+    ports if given, with its status and runtime (s). The analysis is
+    aborted after limit seconds, if any. FA variants only check the VL
+    deadlines if admit is true. Each analysis runs in up to threads threads.
+
+    collect(config) registers the exporters of the results before the
+    analysis, and returns a function adding them to its result: a summary
+    by default, the exported events for distributed.py."""
+    start = time.perf_counter()
+    result = {'path': path, 'status': 'ok'}
+    if limit:
+        signal.signal(signal.SIGALRM, timeout)
+        signal.setitimer(signal.ITIMER_REAL, limit)
+    try:
+        config = read_config(path, latency)
+        if ports is not None:
+            config = config.subset(ports)
+        check_load(config.nodes.values())
+        report = collect(config)
+        for variant, tool in zip(variants, build(config, variants)):
+            if admit:
+                result.setdefault('admission', {})[variant] = admission(tool)
+            else:
+                tool.threads = threads
+                tool.compute_all()
+        report(result)
+    except Exception as error:
+        result['status'] = 'error'
+        result['error'] = f'{type(error).__name__}: {error}'
+    finally:
+        if limit:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+    result['runtime'] = time.perf_counter() - start
+    return result
+
+
+def expand(patterns):
+    """Paths matching a list of paths or globs, in order, without
+    duplicates."""
+    paths = {}
+    for pattern in patterns:
+        for path in sorted(glob(pattern, recursive=True)) or [pattern]:
+            paths[path] = None
+    return list(paths)
+
+
+def add_arguments(parser):
+    """Add the options of the analyses, shared with distributed.py."""
+    parser.add_argument('mod', nargs='+',
+                        help='.mod configuration files, or globs of them')
+    parser.add_argument('-a', '--analyses', nargs='+',
+                        choices=[*FA_VARIANTS, *BUFDIM_VARIANTS,
+                                 *SIM_VARIANTS],
+                        default=['fa-p', 'fa-sp', 'bd-s'],
+                        help='analysis variants, in computation order: '
+                        'FA with serialization (s) and/or static priorities '
+                        '(p), BufDim (bd) with the last FA before it, '
+                        'simulation (sim) of random offsets')
+    parser.add_argument('-l', '--latency', type=float, default=16,
+                        help='switching latency (µs)')
+    parser.add_argument('-t', '--timeout', type=float, default=None,
+                        help='time limit of the analysis of a configuration '
+                        '(or part of it), after which it is reported as '
+                        'failed (s)')
+    parser.add_argument('--threads', type=int, default=1,
+                        help='threads sharing the results of each analysis, '
+                        'for free-threaded Python')
+    parser.add_argument('-o', '--output', default='-',
+                        help='JSON summary file (default: standard output)')
+
+
+def check_analyses(parser, args):
+    """Exit with an error if a BufDim variant has no FA variant before
+    it."""
+    for variant in args.analyses:
+        if variant in FA_VARIANTS:
+            break
+        if variant in BUFDIM_VARIANTS:
+            parser.error(f'{variant} needs an FA variant before it')
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_arguments(parser)
+    parser.add_argument('--admit', action='store_true',
+                        help='only check that the VLs meet their deadlines '
+                        'with each FA variant, stopping at the first miss')
+    parser.add_argument('-j', '--jobs', type=int, default=None,
+                        help='worker processes (default: all processors)')
+    args = parser.parse_args(argv)
+    check_analyses(parser, args)
+    if args.admit and not set(args.analyses) <= set(FA_VARIANTS):
+        parser.error('--admit only applies to FA variants')
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    paths = expand(args.mod)
+    start = time.perf_counter()
+    run = partial(analyse, args.analyses, args.latency, limit=args.timeout,
+                  admit=args.admit, threads=args.threads)
+    if args.jobs == 1:
+        results = list(map(run, paths))
+    else:
+        with ProcessPoolExecutor(args.jobs) as pool:
+            results = list(pool.map(run, paths, chunksize=4))
+
+    summary = {
+        'analyses': args.analyses,
+        'latency': args.latency,
+        'admit': args.admit,
+        'runtime': time.perf_counter() - start,
+        'failed': sum(result['status'] != 'ok' for result in results),
+        'configurations': results,
+    }
+    if args.output == '-':
+        json.dump(summary, sys.stdout, indent=1)
+    else:
+        with open(args.output, 'w') as f:
+            json.dump(summary, f, indent=1)
+    return 1 if summary['failed'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,4 +1,6 @@
+from random import Random
 from collections import deque
+from util.trace import traced
 from . import base
 
 
@@ -62,8 +64,37 @@ class Configuration(base.Configuration):
     def get_port(self, comp_name, port_num):
         return self.components[comp_name][port_num]
 
+    def subset(self, node_ids):
+        """Copy of the ports of node_ids and of the VLs crossing them only,
+        sharing no object with the original configuration."""
+        node_ids = set(node_ids)
+        conf = Configuration(name=self.name)
+
+        for name, component in self.components.items():
+            ports = [port for port in component if port.port_id in node_ids]
+            if not ports:
+                continue
+            copy = conf.components[name] = type(component)(name)
+            for port in ports:
+                copy.add_port(port.num, port.R, port.idle_slopes, port.L)
+            conf.ports.update({p.port_id: p for p in copy})
+
+        for num, vl in self.vls.items():
+            if not all(port.port_id in node_ids for port in vl):
+                continue
+            copy = conf.vls[num] = VL(num, vl.bag, vl.s_max, vl.s_min, vl.prio)
+            copy.deadline = vl.deadline
+            for dest, source in vl.sources.items():
+                dest = conf.ports[dest.port_id]
+                source = source and conf.ports[source.port_id]
+                copy.add_path(source, dest)
+                dest.add_flow(source, copy)
+
+        return conf
+
     @staticmethod
-    def from_mod_file(confname, latency=16):
+    @traced
+    def from_mod_file(confname, latency=16, path=None):
 
         def read_comp(file, CompType):
             name, port_count = next(file).split()
@@ -105,7 +136,8 @@ class Configuration(base.Configuration):
 
         conf = Configuration(name=confname)
 
-        with open(f'./assets/{confname}.mod', 'r') as mod_file:
+        path = f'./assets/{confname}.mod' if path is None else path
+        with open(path, 'r') as mod_file:
             es_count = int(next(mod_file))
             for _ in range(es_count):
                 read_comp(mod_file, Es)
@@ -117,3 +149,86 @@ class Configuration(base.Configuration):
                 read_vl(mod_file)
 
         return conf
+
+    @staticmethod
+    def generate(seed=0, es_count=12, switch_count=6, vl_count=60,
+                 max_load=0.8, rate=100.0, latency=16):
+        """Random configuration: end systems attached to the switches of a
+        random tree, and VLs from an end system to one to three others,
+        along the tree, which keeps the ports free of cyclic dependencies.
+        VLs which would load a port above max_load are drawn again, up to
+        ten times vl_count draws. Ports without VLs are left out.
+
+        >>> conf = Configuration.generate(seed=1, vl_count=20)
+        >>> len(conf.ports), len(conf.vls), conf.vls[1]
+        (30, 20, VL(1))
+        """
+        rng = Random(seed)
+        conf = Configuration(name=f'random{seed}')
+        switches = [f'S{k}' for k in range(1, switch_count + 1)]
+        end_systems = [f'ES{k}' for k in range(1, es_count + 1)]
+        links = [(switches[k], rng.choice(switches[:k]))
+                 for k in range(1, switch_count)]
+        links += [(es, rng.choice(switches)) for es in end_systems]
+        neighbours = {name: [] for name in switches + end_systems}
+        for a, b in links:
+            neighbours[a].append(b)
+            neighbours[b].append(a)
+        ports = {}  # (component, neighbour): port towards the neighbour
+        for name, CompType in [*((es, Es) for es in end_systems),
+                               *((sw, Switch) for sw in switches)]:
+            component = conf.components[name] = CompType(name)
+            for num, neighbour in enumerate(neighbours[name], 1):
+                component.add_port(num, rate, [], latency)
+                ports[name, neighbour] = component[num]
+            conf.ports.update({p.port_id: p for p in component})
+
+        def route(src, dest):
+            """Ports from src to dest, along the tree."""
+            prev, todo = {src: None}, [src]
+            while todo:
+                name = todo.pop()
+                for neighbour in neighbours[name]:
+                    if neighbour not in prev:
+                        prev[neighbour] = name
+                        todo.append(neighbour)
+            path = [dest]
+            while path[-1] != src:
+                path.append(prev[path[-1]])
+            path.reverse()
+            return [ports[a, b] for a, b in zip(path, path[1:])]
+
+        loads = dict.fromkeys(ports.values(), 0.0)
+        draws = 0
+        while len(conf.vls) < vl_count and draws < 10 * vl_count:
+            draws += 1
+            src, *dests = rng.sample(end_systems, rng.randint(2, 4))
+            vl = VL(num=len(conf.vls) + 1,
+                    bag=rng.choice((1000.0, 2000.0, 4000.0, 8000.0)),
+                    s_max=rng.choice((1000.0, 2000.0, 4000.0, 8000.0)),
+                    s_min=512.0, prio=rng.randint(0, 2))
+            sources = {}
+            for dest in dests:
+                source = None
+                for port in route(src, dest):
+                    sources.setdefault(port, source)
+                    source = port
+            if any(loads[port] + vl.C(port) / vl.T > max_load
+                   for port in sources):
+                continue
+            for dest, source in sources.items():
+                loads[dest] += vl.C(dest) / vl.T
+                vl.add_path(source, dest)
+                dest.add_flow(source, vl)
+            conf.vls[vl.num] = vl
+        return conf.subset(port.port_id for port in conf.ports.values()
+                           if port.flows_by_src)
+
+    def read_deadlines(self, path):
+        """Read the end-to-end deadlines (µs) of VLs from a file of lines
+        '<VL number> <deadline>'. VLs without a deadline have none."""
+        with open(path, 'r') as dl_file:
+            for line in dl_file:
+                if line.strip():
+                    num, deadline = line.split()
+                    self.vls[int(num)].deadline = float(deadline)
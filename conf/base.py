@@ -1,5 +1,8 @@
 from collections import defaultdict
 from functools import reduce
+from hashlib import sha256
+from concurrent.futures import ThreadPoolExecutor
+from util.trace import span
 
 
 class Flow():
@@ -11,6 +14,7 @@ class Flow():
         self.paths = defaultdict(set)
         self.sources = dict()
         self.prio = int(prio)
+        self.deadline = float('inf')
 
     def __repr__(self):
         return f'{type(self).__name__}({self.flow_id})'
@@ -61,10 +65,74 @@ class Configuration():
         self.exporters = []
         self.name = name
 
+    def digest(self):
+        """Hash of the nodes and flows of the configuration, as hex."""
+        h = sha256()
+        for node_id, node in sorted(self.nodes.items()):
+            h.update(repr((node_id, node.R, node.L)).encode())
+        for flow_id, flow in sorted(self.flows.items()):
+            paths = sorted((dest.node_id, source and source.node_id)
+                           for dest, source in flow.sources.items())
+            h.update(repr((flow_id, flow.T, flow.s_max, flow.s_min,
+                           flow.prio, paths)).encode())
+        return h.hexdigest()
+
     def register(self, exporter, *args, **kwargs):
         self.exporters.append(exporter(self, *args, **kwargs))
 
-    def render_all(self):
-        for exporter in self.exporters:
-            if exporter.renderable():
+    def partition(self):
+        """Split the configuration into independent sub-configurations, one
+        for each connected component of the graph of nodes sharing flows."""
+        parent = {node: node for node in self.nodes.values()}
+
+        def find(node):
+            while parent[node] is not node:
+                parent[node] = node = parent[parent[node]]
+            return node
+
+        for flow in self.flows.values():
+            first, *others = map(find, flow)
+            for node in others:
+                parent[find(node)] = find(first)
+
+        parts = defaultdict(list)
+        for node_id, node in self.nodes.items():
+            parts[find(node)].append(node_id)
+        return [self.subset(node_ids) for node_ids in parts.values()]
+
+    def subset(self, node_ids):
+        """Copy of a set of nodes and of the flows crossing them only,
+        sharing no object with the original configuration."""
+        node_ids = set(node_ids)
+        conf = Configuration(name=self.name)
+        for node_id, node in self.nodes.items():
+            if node_id in node_ids:
+                conf.nodes[node_id] = Node(node_id, node.R,
+                                           list(node.idle_slopes), node.L)
+
+        for flow_id, flow in self.flows.items():
+            if not all(node.node_id in node_ids for node in flow):
+                continue
+            copy = conf.flows[flow_id] = Flow(flow_id, flow.T, flow.s_max,
+                                              flow.s_min, flow.prio)
+            copy.deadline = flow.deadline
+            for dest, source in flow.sources.items():
+                dest = conf.nodes[dest.node_id]
+                source = source and conf.nodes[source.node_id]
+                copy.add_path(source, dest)
+                dest.add_flow(source, copy)
+
+        return conf
+
+    def render_all(self, jobs=None):
+        """Render the exporters concurrently, in up to jobs threads."""
+        renderable = [exporter for exporter in self.exporters
+                      if exporter.renderable()]
+        def render(exporter):
+            with span('render', exporter=exporter.name):
                 exporter.render()
+
+        with ThreadPoolExecutor(jobs) as pool:
+            for future in [pool.submit(render, exporter)
+                           for exporter in renderable]:
+                future.result()
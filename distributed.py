@@ -0,0 +1,409 @@
+"""Analyse many network configurations on several hosts: a coordinator hands
+out work items to workers over TCP, and merges their results into the JSON
+summary of batch.py.
+
+    python distributed.py coordinate 'assets/gen*.mod' -a fa-p fa-sp bd-s \\
+        --host 0.0.0.0 --port 8766 --split -o summary.json
+    python distributed.py work coordinator:8766 -j 8    # On each host
+
+A work item is a configuration, or with --split one of its independent sets
+of ports (see conf.base.Configuration.partition), given by the path of its
+.mod file and the ids of its ports: paths must be readable by every worker,
+e.g. on a shared file system. Workers reply with the results their analyses
+exported, which the coordinator replays into the exporters of the
+configuration once all its items are done (see tools.parallel).
+
+Messages are lines of JSON. Items of a worker which disconnects, or does not
+reply within --item-timeout seconds, are handed out again, up to --retries
+times. Workers may join at any time; progress is reported on the standard
+error output. With --workers, the coordinator also starts that many workers
+on localhost.
+"""
+
+import sys
+import json
+import time
+import socket
+import argparse
+import threading
+import socketserver
+from collections import Counter, defaultdict, deque, namedtuple
+from multiprocessing import Process
+from exporter.base import Recorder, Ref, replay
+from exporter.buffer import BufferCSV
+from exporter.flow import FlowCSV
+from exporter.summary import Summary
+import batch
+from batch import expand, read_config
+
+# Hooks of the results sent back by workers
+HOOKS = ('res', 'res_R', 'res_Sextr')
+
+Item = namedtuple('Item', 'id path ports part parts')
+
+
+def send(wfile, message):
+    wfile.write(json.dumps(message).encode() + b'\n')
+    wfile.flush()
+
+
+def receive(rfile):
+    line = rfile.readline()
+    if not line:
+        raise ConnectionError('Connection closed')
+    return json.loads(line)
+
+
+def encode(obj):
+    """JSON-compatible copy of a recorded event, with references to flows
+    and nodes as {'ref': [kind, key]} and tuples as {'tuple': [...]}."""
+    if isinstance(obj, Ref):
+        return {'ref': list(obj)}
+    if isinstance(obj, tuple):
+        return {'tuple': [encode(value) for value in obj]}
+    if isinstance(obj, list):
+        return [encode(value) for value in obj]
+    return obj
+
+
+def decode(obj):
+    """Recorded event from its encode() copy."""
+    if isinstance(obj, dict):
+        if 'ref' in obj:
+            return Ref(*obj['ref'])
+        return tuple(decode(value) for value in obj['tuple'])
+    if isinstance(obj, list):
+        return [decode(value) for value in obj]
+    return obj
+
+
+def record(config):
+    """Register a recorder of the results exported by the analyses of
+    config, and return a function adding them to a reply (see
+    batch.analyse)."""
+    config.register(Recorder, hooks=HOOKS)
+    recorder = config.exporters[-1]
+
+    def report(reply):
+        reply['events'] = [encode(list(event)) for event in recorder.events]
+    return report
+
+
+def analyse(item, analyses, latency=16, limit=None, threads=1):
+    """Reply to a work item: batch.analyse of a configuration, or of some of
+    its ports, with the results exported by the analyses rather than their
+    summary."""
+    reply = batch.analyse(analyses, latency, item['path'], limit,
+                          threads=threads, ports=item['ports'],
+                          collect=record)
+    reply['id'] = item['id']
+    return reply
+
+
+def connect(address, attempts):
+    """Connection to address, trying once a second up to attempts times."""
+    for attempt in range(attempts):
+        try:
+            return socket.create_connection(address)
+        except OSError:
+            if attempt == attempts - 1:
+                raise
+            time.sleep(1.0)
+
+
+def serve(address, attempts=10):
+    """Analyse the items sent by the coordinator at address (host, port),
+    one at a time, until it has none left. The coordinator may start up to
+    attempts seconds later. A worker whose connection is lost, e.g. dropped
+    after an item timed out, connects again, unless the coordinator is
+    gone."""
+    sock = connect(address, attempts)
+    while True:
+        try:
+            with sock, sock.makefile('rb') as rfile, \
+                    sock.makefile('wb') as wfile:
+                setup = receive(rfile)
+                while (item := receive(rfile)) is not None:
+                    send(wfile, analyse(item, **setup))
+                return
+        except OSError:
+            pass
+        try:
+            sock = connect(address, 1)
+        except OSError:
+            return
+
+
+def work(address, jobs=1):
+    """Run jobs worker processes for the coordinator at address."""
+    if jobs == 1:
+        serve(address)
+        return
+    processes = [Process(target=serve, args=(address, ))
+                 for _ in range(jobs)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+
+class Coordinator():
+    """Work items to hand out to workers, and the results of each
+    configuration, merged by merge(path, replies) once all its items are
+    done. Results known beforehand (e.g. configurations which could not be
+    split) are given as results."""
+
+    def __init__(self, items, setup, merge, results=(), retries=2,
+                 timeout=None, out=sys.stderr):
+        self.setup = setup
+        self.merge = merge
+        self.retries = retries
+        self.timeout = timeout
+        self.out = out
+        self.total = len(items)
+        self.pending = deque(items)
+        self.attempts = Counter()
+        self.replies = defaultdict(dict)
+        self.results = dict(results)
+        self.expected = len(self.results) + len({item.path for item in items})
+        self.left = len(items)
+        self.retried = 0
+        self.condition = threading.Condition()
+
+    def report(self, item, status, worker):
+        part = f' (part {item.part + 1}/{item.parts})' \
+            if item.parts > 1 else ''
+        print(f'[{self.total - self.left}/{self.total}] {item.path}{part}: '
+              f'{status} on {worker}', file=self.out, flush=True)
+
+    def take(self):
+        """Next item to hand out, waiting while the others are in progress
+        and may fail, or None once all the items are done."""
+        with self.condition:
+            while not self.pending and self.left:
+                self.condition.wait()
+            return self.pending.popleft() if self.pending else None
+
+    def done(self, item, reply, worker):
+        with self.condition:
+            replies = self.replies[item.path]
+            replies[item.part] = reply
+            self.left -= 1
+            self.report(item, f'{reply["status"]} in {reply["runtime"]:.3g} s',
+                        worker)
+            complete = len(replies) == item.parts
+            if complete:
+                del self.replies[item.path]
+            self.condition.notify_all()
+        if complete:
+            result = self.merge(item.path,
+                                [replies[k] for k in range(item.parts)])
+            with self.condition:
+                self.results[item.path] = result
+                self.condition.notify_all()
+
+    def failed(self, item, error, worker):
+        """Hand out an item again after a failure of its worker, unless it
+        failed too many times."""
+        error = f'{type(error).__name__}: {error}'
+        with self.condition:
+            self.attempts[item.id] += 1
+            retry = self.attempts[item.id] <= self.retries
+            if retry:
+                self.pending.appendleft(item)
+                self.retried += 1
+                self.report(item, f'worker failure ({error}), retrying',
+                            worker)
+                self.condition.notify_all()
+        if not retry:
+            self.done(item, {'status': 'error', 'runtime': 0.0,
+                             'error': f'Worker failure: {error}'}, worker)
+
+    def wait(self):
+        """Results of all the configurations, once merged."""
+        with self.condition:
+            while len(self.results) < self.expected:
+                self.condition.wait()
+            return self.results
+
+
+class Handler(socketserver.StreamRequestHandler):
+    """Connection of a worker: items are sent one at a time, each once the
+    reply to the previous one is received, then null once all are done."""
+
+    def handle(self):
+        coordinator = self.server.coordinator
+        worker = '{}:{}'.format(*self.client_address)
+        self.request.settimeout(coordinator.timeout)
+        try:
+            send(self.wfile, coordinator.setup)
+        except OSError:
+            return
+        while (item := coordinator.take()) is not None:
+            try:
+                send(self.wfile, {'id': item.id, 'path': item.path,
+                                  'ports': item.ports})
+                reply = receive(self.rfile)
+                if reply.get('id') != item.id:
+                    raise ValueError(f'Reply to item {reply.get("id")}')
+            except (OSError, ValueError) as error:
+                coordinator.failed(item, error, worker)
+                return
+            coordinator.done(item, reply, worker)
+        try:
+            send(self.wfile, None)
+        except OSError:
+            pass
+
+
+class Server(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+def split(paths, latency, parts=False):
+    """Work items for configuration files, one for each independent set of
+    ports of each configuration if parts is true, and the results of the
+    configurations which could not be read."""
+    items, results = [], {}
+    for path in paths:
+        if not parts:
+            items.append(Item(len(items), path, None, 0, 1))
+            continue
+        try:
+            port_sets = [list(part.nodes)
+                         for part in read_config(path, latency).partition()]
+        except Exception as error:
+            results[path] = {'path': path, 'status': 'error', 'runtime': 0.0,
+                             'error': f'{type(error).__name__}: {error}'}
+            continue
+        for k, ports in enumerate(port_sets):
+            items.append(Item(len(items), path, ports, k, len(port_sets)))
+    return items, results
+
+
+def merge(latency, csv, path, replies):
+    """Result of a configuration, as given by batch.py, from the replies to
+    its items. Exported results are replayed into a summary, and into CSV
+    files if csv is true."""
+    result = {'path': path, 'status': 'ok', 'parts': len(replies),
+              'runtime': sum(reply['runtime'] for reply in replies)}
+    errors = [reply['error'] for reply in replies if reply['status'] != 'ok']
+    if errors:
+        result['status'], result['error'] = 'error', errors[0]
+        return result
+    try:
+        config = read_config(path, latency)
+        config.register(Summary)
+        if csv:
+            config.register(FlowCSV)
+            config.register(BufferCSV)
+        for reply in replies:
+            replay(config, map(decode, reply['events']))
+        if csv:
+            config.render_all()
+        summary = config.exporters[0].as_dict()
+        result['vls'], result['ports'] = summary['flows'], summary['nodes']
+    except Exception as error:
+        result['status'] = 'error'
+        result['error'] = f'{type(error).__name__}: {error}'
+    return result
+
+
+def coordinate(args):
+    paths = expand(args.mod)
+    start = time.perf_counter()
+    items, results = split(paths, args.latency, args.split)
+    setup = {'analyses': args.analyses, 'latency': args.latency,
+             'limit': args.timeout, 'threads': args.threads}
+    coordinator = Coordinator(
+        items, setup, lambda path, replies: merge(args.latency, args.csv,
+                                                  path, replies),
+        results, args.retries, args.item_timeout)
+    server = Server((args.host, args.port), Handler)
+    server.coordinator = coordinator
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address[:2]
+    print(f'Coordinating {len(items)} items on {host}:{port}',
+          file=sys.stderr, flush=True)
+    workers = [Process(target=serve, args=(('127.0.0.1', port), ))
+               for _ in range(args.workers)]
+    for worker in workers:
+        worker.start()
+
+    results = coordinator.wait()
+    server.shutdown()
+    server.server_close()
+    for worker in workers:
+        worker.join()
+
+    configurations = [results[path] for path in paths]
+    summary = {
+        'analyses': args.analyses,
+        'latency': args.latency,
+        'split': args.split,
+        'runtime': time.perf_counter() - start,
+        'retries': coordinator.retried,
+        'failed': sum(result['status'] != 'ok' for result in configurations),
+        'configurations': configurations,
+    }
+    if args.output == '-':
+        json.dump(summary, sys.stdout, indent=1)
+    else:
+        with open(args.output, 'w') as f:
+            json.dump(summary, f, indent=1)
+    return 1 if summary['failed'] else 0
+
+
+def address(text):
+    host, _, port = text.rpartition(':')
+    return host or '127.0.0.1', int(port)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    modes = parser.add_subparsers(dest='mode', required=True)
+
+    coord = modes.add_parser('coordinate', help='hand out work items')
+    batch.add_arguments(coord)
+    coord.add_argument('--split', action='store_true',
+                       help='one item for each independent set of ports of '
+                       'a configuration, rather than for each configuration')
+    coord.add_argument('--csv', action='store_true',
+                       help='also export the delays and backlogs of each '
+                       'configuration as CSV files')
+    coord.add_argument('--host', default='127.0.0.1',
+                       help='address to listen on (0.0.0.0 for all)')
+    coord.add_argument('-p', '--port', type=int, default=8766,
+                       help='port to listen on (0 for any)')
+    coord.add_argument('-r', '--retries', type=int, default=2,
+                       help='times an item is handed out again after '
+                       'failures of its workers')
+    coord.add_argument('--item-timeout', type=float, default=3600.0,
+                       help='time after which a worker which did not reply '
+                       'is considered failed (s)')
+    coord.add_argument('-w', '--workers', type=int, default=0,
+                       help='worker processes to start on localhost')
+
+    work_ = modes.add_parser('work', help='analyse work items')
+    work_.add_argument('address', type=address,
+                       help='host:port of the coordinator')
+    work_.add_argument('-j', '--jobs', type=int, default=1,
+                       help='worker processes')
+
+    args = parser.parse_args(argv)
+    if args.mode == 'coordinate':
+        batch.check_analyses(parser, args)
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.mode == 'work':
+        work(args.address, args.jobs)
+        return 0
+    return coordinate(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
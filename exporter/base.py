@@ -1,13 +1,39 @@
 import time
+import heapq
+import threading
 from functools import lru_cache
+from itertools import groupby
+from operator import itemgetter
+from collections import namedtuple
+from conf.base import Flow, Node
+from tools.results import Results
 
 
 class Exporter():
+    reads_results = False  # Tools only fill their result tables if True
+
     def __init__(self, config, timestamp=False):
         self.timestamp = time.strftime('%Y%m%d-%H%M%S') if timestamp else None
         self.name = self.__class__.__name__
         self.config = config
         self.folder = f'./export/{self.config.name}'
+        self.lock = threading.RLock()  # Held by tools to export an event
+
+    def export(self, tool, obj, fn, hook, *args, key=()):
+        """Receive an event of a tool. key holds the arguments of the
+        result, if it is computed for several of them, e.g. (Ci, prio) for
+        the backlogs of a node by priority."""
+        self.receive(tool.__class__.__name__, base_class_name(obj), fn, hook,
+                     obj, *args)
+
+    def receive_from(self, description, *event, key=()):
+        """Receive a replayed event, exported by a tool with a given repr
+        (i.e. with its options)."""
+        self.receive(*event)
+
+    def persist(self):
+        """Write the output of the events received so far which is not
+        kept in memory until render, e.g. before a checkpoint."""
 
 
 @lru_cache(maxsize=None)
@@ -19,22 +45,115 @@ def base_class_name(obj):
 
 
 class FunExporter(Exporter):
-    def export(self, tool, obj, fn, hook, *args):
-        fn_name = '_'.join((
-            tool.__class__.__name__,
-            base_class_name(obj),
-            fn,
-            hook
-        ))
+    def receive(self, tool, cls, fn, hook, obj, *args):
+        fn_name = '_'.join((tool, cls, fn, hook))
         if hasattr(self, fn_name):
             getattr(self, fn_name)(obj, *args)
 
 
 class DispatchExporter(Exporter):
-    def export(self, tool, obj, fn, hook, *args):
-        self.dispatch(tool.__class__.__name__,
-                      base_class_name(obj),
-                      fn,
-                      hook,
-                      obj,
-                      *args)
+    def receive(self, tool, cls, fn, hook, obj, *args):
+        self.dispatch(tool, cls, fn, hook, obj, *args)
+
+
+class TableExporter(Exporter):
+    """Exporter of the result tables of tools (see tools.results), by tool
+    description, in order: the tables of the tools themselves, or tables
+    filled with replayed events, e.g. from other processes."""
+
+    reads_results = True
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.tables = {}
+        self.descriptions = {}  # By tool, once its table is known
+
+    def export(self, tool, obj, fn, hook, *args, key=()):
+        if tool in self.descriptions:
+            return
+        description = self.descriptions[tool] = repr(tool)
+        table = self.tables.get(description)
+        if table is not None:  # Replayed results, e.g. from a checkpoint
+            tool.results.update(table)
+        self.tables[description] = tool.results
+
+    def receive_from(self, description, tool, cls, fn, hook, obj, *args,
+                     key=()):
+        if description not in self.tables:
+            self.tables[description] = Results(self.config)
+        self.tables[description].receive(fn, hook, obj, *args)
+
+    def receive(self, tool, *event):
+        self.receive_from(tool, tool, *event)
+
+    def rows(self, kind):
+        """Ids and results of the rows of the tables ('node' or 'hop'
+        rows), merged by ids, in order."""
+        tables = [getattr(table, f'{kind}_rows')()
+                  for table in self.tables.values()]
+        for key, rows in groupby(heapq.merge(*tables, key=itemgetter(0)),
+                                 key=itemgetter(0)):
+            res = {}
+            for _, results in rows:
+                res.update(results)
+            yield key, res
+
+
+Ref = namedtuple('Ref', 'kind key')
+
+
+def to_ref(obj):
+    """Replace a flow or a node by a reference to its id."""
+    if isinstance(obj, Flow):
+        return Ref('flow', obj.flow_id)
+    if isinstance(obj, Node):
+        return Ref('node', obj.node_id)
+    return obj
+
+
+def from_ref(config, obj):
+    """Get back a flow or a node of config from its reference."""
+    if isinstance(obj, Ref):
+        return (config.flows if obj.kind == 'flow' else config.nodes)[obj.key]
+    return obj
+
+
+class Recorder(Exporter):
+    """Record received events, with the repr of their tool, the key of
+    their result and with flows and nodes replaced by references, to replay
+    them later, e.g. in another process. Only the events of some functions
+    and hooks are recorded if fns and hooks are given."""
+
+    def __init__(self, *args, fns=None, hooks=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fns = fns
+        self.hooks = hooks
+        self.events = []
+
+    def export(self, tool, obj, fn, hook, *args, key=()):
+        self.receive_from(repr(tool), tool.__class__.__name__,
+                          base_class_name(obj), fn, hook, obj, *args, key=key)
+
+    def receive_from(self, description, tool, cls, fn, hook, obj, *args,
+                     key=()):
+        if ((self.fns is not None and fn not in self.fns)
+                or (self.hooks is not None and hook not in self.hooks)):
+            return
+        self.events.append((description, tool, cls, fn, hook, to_ref(obj),
+                            tuple(map(to_ref, args)), key))
+
+    def receive(self, tool, *event):
+        self.receive_from(tool, tool, *event)
+
+    def renderable(self):
+        return False
+
+
+def replay(config, events):
+    """Send recorded events to the exporters of config."""
+    for description, tool, cls, fn, hook, obj, args, key in events:
+        obj = from_ref(config, obj)
+        args = [from_ref(config, arg) for arg in args]
+        for exporter in config.exporters:
+            exporter.receive_from(description, tool, cls, fn, hook, obj, *args,
+                                  key=tuple(key))
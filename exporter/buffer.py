@@ -1,10 +1,16 @@
 from os import makedirs
+from array import array
+from bisect import bisect_left, bisect_right
 from collections import defaultdict
-from exporter.base import FunExporter, DispatchExporter
+from concurrent.futures import ProcessPoolExecutor
+from exporter.base import FunExporter, TableExporter
 from util.helpers import list_str
 
 
-class BufferCSV(DispatchExporter):
+class BufferCSV(TableExporter):
+    """Backlogs of each node, as a CSV file written from the result tables
+    of the tools, in rows sorted by node."""
+
     node_cols = [
         'node_id',
         'R',
@@ -16,14 +22,11 @@ class BufferCSV(DispatchExporter):
     def __init__(self, *args, sep=';', **kwargs):
         super().__init__(*args, **kwargs)
         self.sep = sep
-        self.res = defaultdict(dict)
-        self.data_cols = set()
 
-    def dispatch(self, tool, cls, fn, hook, obj, *args):
-        if cls.startswith('Node') and fn == 'Bklg' and hook == 'res':
-            col, *max_bklg = args
-            self.data_cols.add(col)
-            self.res[obj][col] = max_bklg
+    @property
+    def data_cols(self):
+        return {col for table in self.tables.values()
+                for col in table.nodes.groups}
 
     def title_line(self):
         for col in self.node_cols:
@@ -40,64 +43,181 @@ class BufferCSV(DispatchExporter):
                 yield item
 
     def renderable(self):
-        return bool(self.res)
+        return bool(self.data_cols)
 
     def render(self):
         makedirs(self.folder, exist_ok=True)
         timestamp = f'-{self.timestamp}' if self.timestamp else ''
         f_name = f'{self.folder}/bklg{timestamp}.csv'
 
-        def node_sort(item):
-            return item[0].node_id
-
         with open(f_name, 'w') as f:
             print(*self.title_line(), sep=self.sep, file=f)
-            for node, res in sorted(self.res.items(), key=node_sort):
+            for node_id, res in self.rows('node'):
+                node = self.config.nodes[node_id]
                 print(*self.data_line(node, res), sep=self.sep, file=f)
 
 
+class Capture():
+    """Cumulative frame count curve, stored as columns: instant and count
+    of each event, and optionally the sizes of the frames of each event.
+
+    >>> c = Capture(sizes=True)
+    >>> for t, Cs, count in [(0, [4, 4], 2), (10, [4], 3), (20, [4], 4),
+    ...                      (30, [4], 5), (35, [2], 6), (40, [4], 7)]:
+    ...     c.append(t, Cs, count)
+    >>> c.count_at(12.0), c.count_at(-1.0), list(c.Cs(0))
+    (3, 0, [4.0, 4.0])
+    >>> list(c.vertices())
+    [0, 1, 2, 3, 4, 5]
+    >>> list(c.vertices((35.0, ), window=1.0))
+    [0, 3, 4, 5]
+    """
+
+    def __init__(self, sizes=False):
+        self.ts = array('d')
+        self.counts = array('l')
+        self.sizes = array('d') if sizes else None
+        self.ends = array('l')
+
+    def __len__(self):
+        return len(self.ts)
+
+    def append(self, t, Cs, count):
+        self.ts.append(t)
+        self.counts.append(count)
+        if self.sizes is not None:
+            self.sizes.extend(Cs)
+            self.ends.append(len(self.sizes))
+
+    def Cs(self, k):
+        """Sizes of the frames of the k-th event."""
+        return self.sizes[self.ends[k - 1] if k else 0:self.ends[k]]
+
+    def count_at(self, t):
+        """Count at instant t, 0 before the first event."""
+        k = bisect_right(self.ts, t)
+        return self.counts[k - 1] if k else 0
+
+    def vertices(self, times=(), window=None):
+        """Indices of the events to draw: all of them, or only those within
+        window of some of the given instants, and those changing the shape
+        of the curve elsewhere, i.e. which are not in the middle of a run of
+        events equally spaced in time and count."""
+        if window is None:
+            return range(len(self))
+        times = sorted(times)
+        ts, counts = self.ts, self.counts
+
+        def near(t):
+            k = bisect_left(times, t - window)
+            return k < len(times) and times[k] <= t + window
+
+        return (k for k in range(len(self))
+                if k in (0, len(self) - 1) or near(ts[k])
+                or ts[k] - ts[k - 1] != ts[k + 1] - ts[k]
+                or counts[k] - counts[k - 1] != counts[k + 1] - counts[k])
+
+
 class BufferGraph(FunExporter):
+    """Frame arrival and departure curves of each node, as TikZ figures.
+
+    The figure of a node is queued as soon as its backlog is known, and its
+    curves are then dropped. Queued figures are written by batches, in jobs
+    worker processes (all available processors if None) unless jobs is 1,
+    so that rendering overlaps with the analysis.
+
+    With a window (µs), only the events around the instants of maximum
+    backlog are drawn in full, regular runs of events elsewhere being drawn
+    as straight lines.
+    """
 
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, window=None, jobs=1, batch=32, **kwargs):
         super().__init__(*args, **kwargs)
-        self.out_curve = defaultdict(list)
-        self.in_curve = defaultdict(list)
+        self.window = window
+        self.jobs = jobs
+        self.batch = batch
+        self.out_curve = defaultdict(Capture)
+        self.in_curve = defaultdict(lambda: Capture(sizes=True))
         self.res = {}
+        self.figures = []
+        self.pool = None
+        self.futures = []
 
     def BufDim_Node_Bklg_out(self, obj, t, Cs, departed):
-        self.out_curve[obj].append((t, Cs, departed))
+        self.out_curve[obj].append(t, Cs, departed)
 
     def BufDim_Node_Bklg_in(self, obj, t, Cs, arrived):
-        self.in_curve[obj].append((t, Cs, arrived))
+        self.in_curve[obj].append(t, Cs, arrived)
 
     def BufDim_Node_Bklg_res(self, obj, *args):
         _, max_value, max_times = args
         self.res[obj] = (max_value, max_times)
+        if obj in self.out_curve:
+            self.render_node(obj)
 
     def renderable(self):
-        return bool(self.out_curve)
+        return bool(self.out_curve or self.figures or self.futures)
+
+    def persist(self):
+        """Write the queued figures, and wait for them to be written."""
+        self.flush()
+        futures, self.futures = self.futures, []
+        for future in futures:
+            future.result()
 
     def render(self):
+        for node in list(self.out_curve):
+            self.render_node(node)
+        self.persist()
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+
+    def render_node(self, node):
         timestamp = f'-{self.timestamp}' if self.timestamp else ''
         folder = f'{self.folder}/{self.name}{timestamp}'
         makedirs(folder, exist_ok=True)
-        xscale = 7
-        for node, out in self.out_curve.items():
-            inp = self.in_curve[node]
-            width, _, height = out[-1]
-            _, burst, _ = inp.pop(0)
-            in_times = ','.join(
-                f"{t:g}/{arrived:g}/{list_str(Cs, sep='+')}/{len(Cs)}"
-                for t, Cs, arrived in inp
-            )
-            max_value, max_times = self.res[node]
-            res_times = ','.join(
-                "{:g}/{:g}".format(t, [departed
-                                       for tt, _, departed in [(0.0, [], 0)] + out
-                                       if tt <= t][-1])
-                for t in max_times
-            )
-            grid = fr"""
+        out = self.out_curve.pop(node)
+        inp = self.in_curve.pop(node)
+        max_value, max_times = self.res.pop(node)
+        self.figures.append((f'{folder}/{node}.pgf', (
+            self.name, self.config.name, self.timestamp, str(node),
+            out, inp, max_value, max_times, self.window)))
+        if len(self.figures) >= self.batch:
+            self.flush()
+
+    def flush(self):
+        """Write the pending figures, in a worker process if jobs is not 1."""
+        figures, self.figures = self.figures, []
+        if not figures:
+            return
+        if self.jobs == 1:
+            write_figures(figures)
+            return
+        if self.pool is None:
+            self.pool = ProcessPoolExecutor(self.jobs)
+        self.futures.append(self.pool.submit(write_figures, figures))
+
+
+def figure(name, config_name, timestamp, node_name,
+           out, inp, max_value, max_times, window=None):
+    """TikZ figure of the arrival and departure curves of a node."""
+    xscale = 7
+    width, height = out.ts[-1], out.counts[-1]
+    burst = inp.Cs(0)
+    in_vertices = [k for k in inp.vertices(max_times, window) if k]
+    out_vertices = list(out.vertices(max_times, window))
+    in_times = ','.join(
+        f"{inp.ts[k]:g}/{inp.counts[k]:g}/"
+        f"{list_str(inp.Cs(k), sep='+')}/{len(inp.Cs(k))}"
+        for k in in_vertices
+    )
+    in_ticks = list_str(inp.ts[k] for k in in_vertices)
+    out_points = ','.join(f'{out.ts[k]:g}/{out.counts[k]:g}'
+                          for k in out_vertices)
+    out_ticks = list_str(out.ts[k] for k in out_vertices)
+    res_times = ','.join(f'{t:g}/{out.count_at(t):g}' for t in max_times)
+    grid = fr"""
 % GRID
 % ----
 \draw [helper, ystep=1, xstep={width}/{xscale}]
@@ -107,23 +227,23 @@ class BufferGraph(FunExporter):
     \draw (up: \i) -- ++(left:.2) node[left, font=\tiny] {{\i}} ;
 """
 
-            out_curve = fr"""
+    out_curve = fr"""
 % OUTPUT CURVE
 % ------------
 \draw[thick, dashed] (0,0)
-    \foreach \x/\y in {{{list_str(out, '{0[0]:g}/{0[2]:g}')}}} {{
+    \foreach \x/\y in {{{out_points}}} {{
         -- (\x/{xscale}, \y-1) coordinate (here)
         edge[helper] (here |- 0,0)
         -- (\x/{xscale}, \y)
     }}
 ;
 % Ticks at bottom
-\foreach \x in {{{list_str(out, '{0[0]:g}')}}}
+\foreach \x in {{{out_ticks}}}
     \draw (\x/{xscale},0)  --++ (down:0.2)  --++(.2,-.2)
         node[rotate=-45, right=0, font=\tiny] {{\x}};
 """
 
-            in_curve = fr"""
+    in_curve = fr"""
 % INPUT CURVE
 % -----------
 \draw[thick] (0, 0) -- (up:{len(burst)})
@@ -137,12 +257,12 @@ class BufferGraph(FunExporter):
     -- ({width}/{xscale}, {height})
 ;
 % Ticks at top
-\foreach \x in {{{list_str(inp, '{0[0]:g}')}}}
+\foreach \x in {{{in_ticks}}}
     \draw (\x/{xscale}, {height + 1}) --++ (up:0.2) --++(.2,.2)
         node[rotate=45, right=0, font=\tiny] {{\x}};
 """
 
-            bklg = fr"""
+    bklg = fr"""
 % MAXIMUM BKLG
 % ------------
 \foreach \x/\y in {{{res_times}}}
@@ -151,7 +271,7 @@ class BufferGraph(FunExporter):
     ;
 """
 
-            title = fr"""
+    title = fr"""
 % TITLES
 % ------
 \path (0,0) -- ++(up:{height + 1})
@@ -162,12 +282,11 @@ class BufferGraph(FunExporter):
     node[midway, below=4ex] {{Frame departure times ($\mu$s)}};
 """
 
-            with open(f'{folder}/{str(node)}.pgf', 'w') as f:
-                f.write(fr"""
-% Config: {self.config.name}
-% Exporter: {self.__class__.__name__}
-% For component: {node}
-% Date: {self.timestamp}
+    return fr"""
+% Config: {config_name}
+% Exporter: {name}
+% For component: {node_name}
+% Date: {timestamp}
 \begin{{tikzpicture}}[xscale=0.5, yscale=0.5]
 \tikzstyle{{helper}}=[thin, gray, dotted]
 {title}
@@ -176,4 +295,11 @@ class BufferGraph(FunExporter):
 {out_curve}
 {bklg}
 \end{{tikzpicture}}
-""")
+"""
+
+
+def write_figures(figures):
+    """Write a batch of figures, given as (path, figure arguments)."""
+    for path, args in figures:
+        with open(path, 'w') as f:
+            f.write(figure(*args))
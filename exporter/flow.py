@@ -1,9 +1,11 @@
 from os import makedirs
-from collections import defaultdict
-from exporter.base import DispatchExporter
+from exporter.base import TableExporter
 
 
-class FlowCSV(DispatchExporter):
+class FlowCSV(TableExporter):
+    """Delays of each flow in each node, as a CSV file written from the
+    result tables of the tools, in rows sorted by flow and node."""
+
     flow_cols = [
         'flow_id',
         'T',
@@ -21,14 +23,11 @@ class FlowCSV(DispatchExporter):
     def __init__(self, *args, sep=';', **kwargs):
         super().__init__(*args, **kwargs)
         self.sep = sep
-        self.res = defaultdict(dict)
-        self.data_cols = set()
-    
-    def dispatch(self, tool, cls, fn, hook, obj, *args):
-        if cls.startswith('Flow') and fn == 'R' and hook.startswith('res_'):
-            node, col, *max_r = args
-            self.data_cols.add(col)
-            self.res[(obj, node)][col] = max_r
+
+    @property
+    def data_cols(self):
+        return {col for table in self.tables.values()
+                for col in table.hops.groups}
 
     def title_line(self):
         for col in self.flow_cols:
@@ -49,14 +48,15 @@ class FlowCSV(DispatchExporter):
                 yield item
 
     def renderable(self):
-        return bool(self.res)
+        return bool(self.data_cols)
 
     def render(self):
         makedirs(self.folder, exist_ok=True)
         timestamp = f'-{self.timestamp}' if self.timestamp else ''
         f_name = f'{self.folder}/flow{timestamp}.csv'
-        fl_nd_sort = lambda item: (item[0][0].flow_id, item[0][1].node_id)
         with open(f_name, 'w') as f:
             print(*self.title_line(), sep=self.sep, file=f)
-            for (flow, node), res in sorted(self.res.items(), key=fl_nd_sort):
+            for (flow_id, node_id), res in self.rows('hop'):
+                flow = self.config.flows[flow_id]
+                node = self.config.nodes[node_id]
                 print(*self.data_line(flow, node, res), sep=self.sep, file=f)
@@ -0,0 +1,120 @@
+import json
+import sqlite3
+import time
+from os import makedirs, path as os_path
+from exporter.base import Exporter, base_class_name
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY,
+    config TEXT,
+    config_hash TEXT,
+    date TEXT,
+    tools TEXT
+);
+CREATE TABLE IF NOT EXISTS backlogs (
+    run_id INTEGER REFERENCES runs,
+    port TEXT,
+    tool TEXT,
+    args TEXT,
+    name TEXT,
+    value REAL
+);
+CREATE TABLE IF NOT EXISTS delays (
+    run_id INTEGER REFERENCES runs,
+    vl TEXT,
+    port TEXT,
+    tool TEXT,
+    name TEXT,
+    value REAL
+);
+CREATE INDEX IF NOT EXISTS backlogs_run ON backlogs (run_id);
+CREATE INDEX IF NOT EXISTS backlogs_port ON backlogs (port);
+CREATE INDEX IF NOT EXISTS delays_run ON delays (run_id);
+CREATE INDEX IF NOT EXISTS delays_vl ON delays (vl);
+CREATE INDEX IF NOT EXISTS delays_port ON delays (port);
+"""
+
+
+class SQLiteStore(Exporter):
+    """Backlogs of each port and delays of each VL in each port, inserted
+    into a SQLite database shared by many runs, by batches of batch_size
+    rows, one transaction each.
+
+    Each run is recorded with the hash of its configuration and the options
+    of its tools; result rows hold every named value of each result, e.g.
+    bklg_b_s, bklg_f_s, Smin, Smax or R_sp, with the tool computing it (its
+    repr, as in the tools of the run) and, for backlogs, the arguments of
+    the result as a JSON list, e.g. [Ci, prio] for the backlogs of a port by
+    priority, and null otherwise.
+    """
+
+    def __init__(self, *args, path='./export/results.sqlite',
+                 batch_size=10000, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.batch_size = batch_size
+        self.backlogs = []
+        self.delays = []
+        self.tools = set()
+        makedirs(os_path.dirname(path) or '.', exist_ok=True)
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        with self.db:
+            self.db.executescript(SCHEMA)
+            self.run_id = self.db.execute(
+                'INSERT INTO runs (config, config_hash, date) VALUES (?, ?, ?)',
+                (self.config.name, self.config.digest(),
+                 time.strftime('%Y-%m-%d %H:%M:%S'))).lastrowid
+
+    def export(self, tool, obj, fn, hook, *args, key=()):
+        if fn in ('Bklg', 'R'):
+            self.receive_from(repr(tool), tool.__class__.__name__,
+                              base_class_name(obj), fn, hook, obj, *args,
+                              key=key)
+
+    def receive_from(self, description, tool, cls, fn, hook, obj, *args,
+                     key=()):
+        self.tools.add(description)
+        self.dispatch(description, cls, fn, hook, obj, *args, key=key)
+
+    def receive(self, tool, *event):
+        self.receive_from(tool, tool, *event)
+
+    @staticmethod
+    def values(cols, values):
+        return ((col, value) for col, value in zip(cols, values)
+                if col != 'times')
+
+    def dispatch(self, tool, cls, fn, hook, obj, *args, key=()):
+        if cls.startswith('Node') and fn == 'Bklg' and hook == 'res':
+            cols, *values = args
+            key = json.dumps(key) if key else None
+            self.backlogs.extend(
+                (self.run_id, obj.node_id, tool, key, col, value)
+                for col, value in self.values(cols, values))
+        elif cls.startswith('Flow') and fn == 'R' and hook.startswith('res_'):
+            node, cols, *values = args
+            self.delays.extend(
+                (self.run_id, str(obj.flow_id), node.node_id, tool, col, value)
+                for col, value in self.values(cols, values))
+        if len(self.backlogs) + len(self.delays) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        with self.db:
+            self.db.executemany(
+                'INSERT INTO backlogs VALUES (?, ?, ?, ?, ?, ?)', self.backlogs)
+            self.db.executemany(
+                'INSERT INTO delays VALUES (?, ?, ?, ?, ?, ?)', self.delays)
+        self.backlogs, self.delays = [], []
+
+    def renderable(self):
+        return self.db is not None
+
+    def render(self):
+        self.flush()
+        with self.db:
+            self.db.execute('UPDATE runs SET tools = ? WHERE run_id = ?',
+                            (json.dumps(sorted(self.tools)),
+                             self.run_id))
+        self.db.close()
+        self.db = None
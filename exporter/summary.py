@@ -0,0 +1,32 @@
+from collections import defaultdict
+from exporter.base import DispatchExporter
+
+
+class Summary(DispatchExporter):
+    """Worst end-to-end delay of each flow and worst backlogs of each node,
+    for each analysis, kept in memory as dicts keyed by result column."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.flows = defaultdict(dict)
+        self.nodes = defaultdict(dict)
+
+    @staticmethod
+    def _max(res, col, value):
+        if value is not None and (col not in res or value > res[col]):
+            res[col] = value
+
+    def dispatch(self, tool, cls, fn, hook, obj, *args):
+        if cls.startswith('Flow') and fn == 'R' and hook == 'res_R':
+            node, (col, _), R, _ = args
+            if node not in obj.paths:  # Last node of a path
+                self._max(self.flows[obj.flow_id], col, R)
+        elif cls.startswith('Node') and fn == 'Bklg' and hook == 'res':
+            (col, *_), value, *_ = args
+            self._max(self.nodes[obj.node_id], col, value)
+
+    def as_dict(self):
+        return {'flows': dict(self.flows), 'nodes': dict(self.nodes)}
+
+    def renderable(self):
+        return False
@@ -0,0 +1,212 @@
+"""Resident analysis server, keeping configurations and their analyses in
+memory and answering JSON queries over localhost HTTP.
+
+    python server.py --port 8765
+    curl -d '{"name": "fifo"}' localhost:8765/load
+    curl 'localhost:8765/vl/fifo/3?analysis=fa-sp'
+    curl 'localhost:8765/port/fifo/S1%202?analysis=fa-sp'
+    curl -d '{"vl": 3, "s_max": 4000}' localhost:8765/whatif/fifo
+
+Delays and backlogs are in µs (frames for BufDim), s_max in bits and T in
+µs. A what-if edit is undone after answering, unless "commit" is true.
+"""
+
+import json
+import argparse
+import threading
+from urllib.parse import urlsplit, parse_qs, unquote
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import conf.afdx
+from batch import (FA_VARIANTS, BUFDIM_VARIANTS, SIM_VARIANTS, build,
+                   check_load)
+from tools.fa import FA
+
+
+class NotFound(LookupError):
+    """A configuration, analysis, VL, port or route which does not exist."""
+
+
+def field(body, name):
+    """Field of a request body, which is required."""
+    if name not in body:
+        raise ValueError(f'Missing field {name!r} in the request body')
+    return body[name]
+
+
+class Session():
+    """A configuration with its analyses, kept warm, and a lock serializing
+    the queries on them."""
+
+    def __init__(self, name, path=None, latency=16,
+                 analyses=('fa-p', 'fa-sp', 'bd-s')):
+        unknown = set(analyses) - {*FA_VARIANTS, *BUFDIM_VARIANTS,
+                                   *SIM_VARIANTS}
+        if unknown:
+            raise ValueError(f'Unknown analyses {", ".join(sorted(unknown))}')
+        self.config = conf.afdx.Configuration.from_mod_file(
+            name, latency, path=path)
+        self.analyses = dict(zip(analyses, build(self.config, analyses)))
+        self.default = next(a for a in analyses if a in FA_VARIANTS)
+        self.lock = threading.Lock()
+        self.warm()
+
+    def warm(self):
+        """Compute the backlogs of all the nodes for every FA variant."""
+        for tool in self.analyses.values():
+            if isinstance(tool, FA):
+                tool.propagate()
+
+    def info(self):
+        return {'analyses': list(self.analyses),
+                'vls': len(self.config.flows),
+                'ports': len(self.config.nodes)}
+
+    def tool(self, analysis=None):
+        analysis = self.default if analysis is None else analysis
+        if analysis not in self.analyses:
+            raise NotFound(f'Unknown analysis {analysis}')
+        return self.analyses[analysis]
+
+    def vl(self, num):
+        if num not in self.config.flows:
+            raise NotFound(f'Unknown VL {num}')
+        return self.config.flows[num]
+
+    def delay(self, num, analysis=None):
+        """Worst end-to-end delay of a VL."""
+        tool = self.tool(analysis)
+        if not isinstance(tool, FA):
+            raise ValueError('Delays are only given by FA variants')
+        flow = tool.flows[self.vl(num)]
+        return max(flow.R(node)[0] for node in flow
+                   if node._model not in flow._model.paths)
+
+    def backlog(self, port_id, analysis=None):
+        """Worst backlog of a port, over the flows crossing it."""
+        tool = self.tool(analysis)
+        if port_id not in self.config.nodes:
+            raise NotFound(f'Unknown port {port_id}')
+        node = tool.nodes[self.config.nodes[port_id]]
+        if not isinstance(tool, FA):
+            return node.Bklg().value
+        return max(flow._get_node_Bklg(node).value for flow in node.flows)
+
+    def whatif(self, num, analysis=None, commit=False, **params):
+        """Worst end-to-end delays of all the VLs once some parameters of a
+        VL are changed. Only the results downstream of the VL are
+        recomputed, and restored afterwards unless commit is true. Edits
+        overloading a port are rejected, and never committed."""
+        self.tool(analysis)
+        if not set(params) <= {'s_max', 'T'}:
+            raise ValueError('Only s_max and T can be changed')
+        vl = self.vl(num)
+        former = {name: getattr(vl, name) for name in params}
+        for name, value in params.items():
+            setattr(vl, name, float(value))
+        tools = list(self.analyses.values())
+        forgotten = [tool.invalidate((vl, )) for tool in tools]
+        committed = False
+        try:
+            check_load(vl)
+            self.warm()
+            delays = {num: self.delay(num, analysis)
+                      for num in self.config.flows}
+            committed = commit
+            return delays
+        finally:
+            if not committed:
+                for name, value in former.items():
+                    setattr(vl, name, value)
+                for tool, results in zip(tools, forgotten):
+                    tool.invalidate((vl, ))
+                    tool.restore(results)
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def reply(self, code, body):
+        data = json.dumps(body).encode()
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def session(self, name):
+        if name not in self.server.sessions:
+            raise NotFound(f'Unknown configuration {name}')
+        return self.server.sessions[name]
+
+    def route(self, method, parts, query, body):
+        analysis = query.get('analysis', [body.get('analysis')])[0]
+        if method == 'GET' and parts == ['configs']:
+            return {name: session.info()
+                    for name, session in self.server.sessions.items()}
+        if method == 'POST' and parts == ['load']:
+            name = field(body, 'name')
+            session = Session(name, body.get('path'), body.get('latency', 16),
+                              body.get('analyses', ('fa-p', 'fa-sp', 'bd-s')))
+            self.server.sessions[name] = session
+            return session.info()
+        if method == 'GET' and len(parts) == 3 and parts[0] == 'vl':
+            session = self.session(parts[1])
+            with session.lock:
+                return {'delay': session.delay(int(parts[2]), analysis)}
+        if method == 'GET' and len(parts) == 3 and parts[0] == 'port':
+            session = self.session(parts[1])
+            with session.lock:
+                return {'backlog': session.backlog(parts[2], analysis)}
+        if method == 'POST' and len(parts) == 2 and parts[0] == 'whatif':
+            session = self.session(parts[1])
+            params = {key: value for key, value in body.items()
+                      if key not in ('vl', 'analysis', 'commit')}
+            with session.lock:
+                return {'delays': session.whatif(
+                    int(field(body, 'vl')), analysis, body.get('commit', False),
+                    **params)}
+        raise NotFound(f'No route for {method} /{"/".join(parts)}')
+
+    def handle_method(self, method):
+        url = urlsplit(self.path)
+        parts = [unquote(part) for part in url.path.split('/') if part]
+        length = int(self.headers.get('Content-Length', 0))
+        try:
+            body = json.loads(self.rfile.read(length) or '{}')
+            if not isinstance(body, dict):
+                raise ValueError('The request body must be a JSON object')
+            self.reply(200, self.route(method, parts, parse_qs(url.query), body))
+        except NotFound as error:
+            self.reply(404, {'error': error.args[0]})
+        except (ValueError, TypeError, OSError, ArithmeticError) as error:
+            self.reply(400, {'error': f'{type(error).__name__}: {error}'})
+        except Exception as error:  # Answer anyway, rather than hang up
+            self.reply(500, {'error': f'{type(error).__name__}: {error}'})
+
+    def do_GET(self):
+        self.handle_method('GET')
+
+    def do_POST(self):
+        self.handle_method('POST')
+
+    def log_message(self, *args):
+        if self.server.verbose:
+            super().log_message(*args)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-p', '--port', type=int, default=8765)
+    parser.add_argument('-v', '--verbose', action='store_true')
+    parser.add_argument('conf', nargs='*',
+                        help='configurations from assets to load at start')
+    args = parser.parse_args(argv)
+
+    server = ThreadingHTTPServer(('127.0.0.1', args.port), Handler)
+    server.sessions = {name: Session(name) for name in args.conf}
+    server.verbose = args.verbose
+    server.serve_forever()
+
+
+if __name__ == '__main__':
+    main()
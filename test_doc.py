@@ -1,5 +1,25 @@
 import doctest
 import tools.bufdim
+import tools.fa
+import tools.reference
+import tools.sim
+import tools.shared
+import tools.sensitivity
+import tools.results
+import conf.afdx
+import exporter.base
+import exporter.buffer
+import util.trace
 
 doctest.testmod(tools.bufdim, verbose=True)
 doctest.testmod(tools.rbf, verbose=True)
+doctest.testmod(tools.fa, verbose=True)
+doctest.testmod(tools.reference, verbose=True)
+doctest.testmod(tools.sim, verbose=True)
+doctest.testmod(tools.shared, verbose=True)
+doctest.testmod(tools.sensitivity, verbose=True)
+doctest.testmod(tools.results, verbose=True)
+doctest.testmod(conf.afdx, verbose=True)
+doctest.testmod(exporter.base, verbose=True)
+doctest.testmod(exporter.buffer, verbose=True)
+doctest.testmod(util.trace, verbose=True)
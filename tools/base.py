@@ -1,5 +1,10 @@
 import inspect
-from functools import cached_property
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from util.helpers import cached_property, memoize
+from util.trace import traced
+from tools.results import Results
 
 
 class Component():
@@ -7,13 +12,27 @@ class Component():
 
     def __init__(self, tool):
         self.tool = tool
-        self.exporters = tool.exporters
+        self.memo = {}
+
+    @property
+    def exporters(self):
+        return self.tool.exporters
 
     def export(self, *args, **kwargs):
+        """Send an event to the exporters, unless exports are muted, and
+        fill the result tables of the tool if one of them reads them."""
+        exporters = self.exporters
+        if not exporters or getattr(self.tool.local, 'muted', False):
+            return
         outerframe = inspect.currentframe().f_back
         calling_function = outerframe.f_code.co_name
-        for exporter in self.exporters:
-            exporter.export(self.tool, self._model, calling_function, *args, **kwargs)
+        if any(exporter.reads_results for exporter in exporters):
+            self.tool.results.receive(calling_function, args[0], self._model,
+                                      *args[1:])
+        for exporter in exporters:
+            with exporter.lock:
+                exporter.export(self.tool, self._model, calling_function,
+                                *args, **kwargs)
 
 
 class Node(Component):
@@ -29,15 +48,18 @@ class Node(Component):
 
     @cached_property
     def flows_by_src(self):
+        """Flows crossing the node by source node, in the order of their
+        ids, so that results and exports never depend on object ids."""
         return {
-            self.tool.nodes[node]: set(map(self.tool.flows.get, flows))
+            self.tool.nodes[node]: tuple(sorted(map(self.tool.flows.get, flows),
+                                                key=Flow.key))
             for node, flows in self._model.flows_by_src.items()
         }
 
     @cached_property
     def flows(self):
-        return {flow for flows in self.flows_by_src.values()
-                for flow in flows}
+        return tuple(sorted((flow for flows in self.flows_by_src.values()
+                             for flow in flows), key=Flow.key))
 
     def __repr__(self):
         return repr(self._model)
@@ -55,6 +77,9 @@ class Flow(Component):
     def __repr__(self):
         return repr(self._model)
 
+    def key(self):
+        return self._model.flow_id
+
     def prev(self, node):
         """Get previous node in a path or current if no previous."""
         return self.tool.nodes.get(self._model.sources[node._model], node)
@@ -69,12 +94,28 @@ class Flow(Component):
 
 
 class Tool():
-    """Generic model of a network configuration made of flows and of nodes"""
+    """Generic model of a network configuration made of flows and of nodes
+
+    Results are kept in columnar tables (see tools.results) as they are
+    exported, if an exporter reads them. Tools may be used from several
+    threads: their results are memoized once, and the exporters receive one
+    event at a time. With threads > 1, compute_all() computes independent
+    nodes in that many threads, sharing the configuration and the results,
+    which only pays on free-threaded builds of Python, and is not
+    checkpointed. Invalidating results must not overlap computations.
+    """
 
+    threads = 1
+
+    @traced
     def __init__(self, config, NodeType, FlowType):
         """Monkey-patch conf, flows and nodes with attributes for a specific tool."""
         self.config = config
         self.exporters = config.exporters
+        self.checkpoint = None
+        self.lock = threading.RLock()
+        self.local = threading.local()
+        self.results = Results(config)
         self.nodes = {node: NodeType(self, node)
                       for node in config.nodes.values()}
         self.flows = {flow: FlowType(self, flow)
@@ -82,3 +123,132 @@ class Tool():
 
     def __repr__(self):
         return f'{type(self).__name__}'
+
+    @contextmanager
+    def muted(self):
+        """Export nothing from the current thread meanwhile, nor fill the
+        result tables."""
+        self.local.muted = True
+        try:
+            yield
+        finally:
+            self.local.muted = False
+
+    def tick(self):
+        """Mark a point where all the memoized results are complete, along
+        with their exports, e.g. to checkpoint them."""
+        if self.checkpoint is not None:
+            self.checkpoint.tick()
+
+    def invalidate(self, flows):
+        """Forget the results depending on the parameters of some flows,
+        after editing them: those of the nodes they cross and of the nodes
+        downstream. Return the forgotten results, for restore()."""
+        for flow in flows:
+            self.flows[flow].T = flow.T
+            self.flows[flow].prio = flow.prio
+        nodes = set()
+        todo = [self.nodes[node] for flow in flows for node in flow]
+        while todo:
+            node = todo.pop()
+            if node not in nodes:
+                nodes.add(node)
+                for flow in node.flows:
+                    nexts = flow._model.paths.get(node._model, ())
+                    todo.extend(map(self.nodes.get, nexts))
+
+        forgotten = []
+        for node in nodes:
+            forgotten.append((node.memo, node.memo.copy()))
+            node.memo.clear()
+            for flow in node.flows:
+                key = ('Sextr', node)
+                if key in flow.memo:
+                    forgotten.append((flow.memo, {key: flow.memo.pop(key)}))
+        return forgotten
+
+    @staticmethod
+    def restore(forgotten):
+        """Restore results forgotten by invalidate(), once the edited flows
+        are back to their former parameters and invalidated again."""
+        for memo, results in forgotten:
+            memo.update(results)
+
+    @memoize
+    def dependency_order(self):
+        """Strongly connected components of the graph where each node
+        depends on the previous nodes of its flows, upstream ones first.
+
+        Components are found by an iterative Tarjan's algorithm, which emits
+        each of them once all the components it depends on are emitted.
+        """
+        deps = {}
+        for node in self.nodes.values():
+            prevs = dict.fromkeys(flow.prev(node) for flow in node.flows)
+            prevs.pop(node, None)  # First node of a path
+            deps[node] = list(prevs)
+        index, low, stack, on_stack, order = {}, {}, [], set(), []
+
+        def visit(node):
+            index[node] = low[node] = len(index)
+            stack.append(node)
+            on_stack.add(node)
+            work.append((node, iter(deps[node])))
+
+        for root in deps:
+            if root in index:
+                continue
+            work = []
+            visit(root)
+            while work:
+                node, it = work[-1]
+                for dep in it:
+                    if dep not in index:
+                        visit(dep)
+                        break
+                    if dep in on_stack:
+                        low[node] = min(low[node], index[dep])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        low[parent] = min(low[parent], low[node])
+                    if low[node] == index[node]:
+                        scc = []
+                        while not scc or scc[-1] is not node:
+                            scc.append(stack.pop())
+                            on_stack.discard(scc[-1])
+                        order.append(scc)
+        return order
+
+    def map_dependency_order(self, fn, threads=None):
+        """Call fn on each set of nodes of dependency_order(), once it has
+        returned for all the sets they depend on, in up to threads threads
+        (as many as processors if None). The tool only ticks once they all
+        returned: meanwhile, the results of some sets may be incomplete."""
+        order = self.dependency_order()
+        index = {node: k for k, nodes in enumerate(order) for node in nodes}
+        waiting = [set() for _ in order]
+        dependents = [[] for _ in order]
+        for k, nodes in enumerate(order):
+            for node in nodes:
+                for flow in node.flows:
+                    upstream = index[flow.prev(node)]
+                    if upstream != k and upstream not in waiting[k]:
+                        waiting[k].add(upstream)
+                        dependents[upstream].append(k)
+
+        with ThreadPoolExecutor(threads) as pool:
+            running = {pool.submit(fn, nodes): k
+                       for k, nodes in enumerate(order) if not waiting[k]}
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    k = running.pop(future)
+                    future.result()
+                    for dependent in dependents[k]:
+                        waiting[dependent].discard(k)
+                        if not waiting[dependent]:
+                            running[pool.submit(fn, order[dependent])] = \
+                                dependent
+        self.tick()
@@ -1,9 +1,11 @@
 import heapq
 from itertools import groupby
-from functools import lru_cache
+from operator import methodcaller
+from concurrent.futures import ThreadPoolExecutor
 from enum import IntEnum, unique
 from sortedcontainers import SortedList
-from util.helpers import MaxFinder
+from util.helpers import MaxFinder, memoize
+from util.trace import traced
 from tools.rbf import RBF, merge_C_streams, stream_tagger
 from . import base
 
@@ -70,7 +72,8 @@ class Node(base.Node):
         in_stream = RBF(CTJs)
         return out_stream, in_stream
 
-    @lru_cache(maxsize=None)
+    @memoize
+    @traced
     def Bklg(self):
         c_node = self.tool.comp_node(self)
         out_stream, in_stream = self.get_streams(c_node)
@@ -149,5 +152,13 @@ class BufDim(base.Tool):
 
     def compute_all(self):
         "Launch the computation for every node in each flow"
+        self.comp.propagate()
+        if self.threads > 1:
+            with ThreadPoolExecutor(self.threads) as pool:
+                for _ in pool.map(methodcaller('Bklg'), self.nodes.values()):
+                    pass
+            self.tick()
+            return
         for node in self.nodes.values():
             node.Bklg()
+            self.tick()
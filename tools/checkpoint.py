@@ -0,0 +1,124 @@
+import os
+import time
+import pickle
+from exporter.base import Recorder, replay, from_ref
+from tools.fa import FixedPoint, MultiFA
+
+
+class Checkpoint():
+    """Periodic snapshot to a file of the backlogs and Sextr computed by
+    some tools, and of the results they exported, so that an interrupted
+    computation can resume with the same configuration and tools.
+
+    Snapshots are taken at most every interval seconds, when a tool ticks,
+    i.e. once the backlogs of some nodes are complete. The exporters first
+    persist what they do not keep until render (e.g. BufferGraph figures),
+    and resume in the same output folders.
+    """
+
+    def __init__(self, path, config, tools, interval=60.0):
+        self.path = path
+        self.config = config
+        # Variants computed together are snapshot one by one
+        self.tools = [fa for tool in tools
+                      for fa in (tool if isinstance(tool, MultiFA) else [tool])]
+        self.interval = interval
+        self.last = time.monotonic()
+        self.key = (config.digest(), [repr(tool) for tool in self.tools])
+        config.register(Recorder, fns=('Bklg', ), hooks=('res', ))
+        self.recorder = config.exporters[-1]
+        for tool in self.tools:
+            tool.checkpoint = self
+
+    @staticmethod
+    def _snapshot(tool):
+        nodes = {node._model.node_id: {key: value
+                                       for key, value in node.memo.items()
+                                       if key[0] == 'Bklg'}
+                 for node in tool.nodes.values()}
+        flows = {flow._model.flow_id: {key[1]._model.node_id: value
+                                       for key, value in flow.memo.items()
+                                       if key[0] == 'Sextr'}
+                 for flow in tool.flows.values()}
+        fixed_points = [FixedPoint([node._model.node_id for node in nodes],
+                                   iterations, residual)
+                        for nodes, iterations, residual
+                        in getattr(tool, 'fixed_points', ())]
+        return nodes, flows, fixed_points
+
+    def _restore(self, tool, snapshot):
+        nodes, flows, fixed_points = snapshot
+        for node_id, results in nodes.items():
+            tool.nodes[self.config.nodes[node_id]].memo.update(results)
+        for flow_id, results in flows.items():
+            flow = tool.flows[self.config.flows[flow_id]]
+            for node_id, value in results.items():
+                node = tool.nodes[self.config.nodes[node_id]]
+                flow.memo[('Sextr', node)] = value
+        if fixed_points:
+            tool.fixed_points[:] = [
+                FixedPoint([tool.nodes[self.config.nodes[node_id]]
+                            for node_id in nodes], iterations, residual)
+                for nodes, iterations, residual in fixed_points]
+
+    def save(self):
+        """Write a snapshot, atomically replacing the former one."""
+        for exporter in self.config.exporters:
+            exporter.persist()
+        timestamps = [(exporter.name, exporter.timestamp)
+                      for exporter in self.config.exporters]
+        state = (self.key, [self._snapshot(tool) for tool in self.tools],
+                 timestamps, self.recorder.events)
+        with open(f'{self.path}.tmp', 'wb') as f:
+            pickle.dump(state, f)
+        os.replace(f'{self.path}.tmp', self.path)
+        self.last = time.monotonic()
+
+    def tick(self):
+        if time.monotonic() - self.last >= self.interval:
+            self.save()
+
+    def resume(self):
+        """Restore the last snapshot if it was taken with the same
+        configuration and tools, replaying its events into the exporters.
+        Return whether there was one."""
+        try:
+            with open(self.path, 'rb') as f:
+                key, snapshots, timestamps, events = pickle.load(f)
+        except FileNotFoundError:
+            return False
+        if key != self.key:
+            return False
+        for tool, snapshot in zip(self.tools, snapshots):
+            self._restore(tool, snapshot)
+        results = {repr(tool): tool.results for tool in self.tools}
+        for description, _, _, fn, hook, obj, args, _ in events:
+            if description in results:
+                results[description].receive(
+                    fn, hook, from_ref(self.config, obj),
+                    *(from_ref(self.config, arg) for arg in args))
+        for exporter, (name, timestamp) in zip(self.config.exporters,
+                                               timestamps):
+            if exporter.name == name:
+                exporter.timestamp = timestamp
+        replay(self.config, events)
+        return True
+
+    def done(self):
+        """Remove the snapshot, once the computation is over."""
+        self.config.exporters.remove(self.recorder)
+        for tool in self.tools:
+            tool.checkpoint = None
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def compute_all(config, build, path, interval=60.0):
+    """Run the analyses built by build(config), in order, resuming from the
+    checkpoint at path if any, and checkpointing every interval seconds."""
+    tools = build(config)
+    checkpoint = Checkpoint(path, config, tools, interval)
+    checkpoint.resume()
+    for tool in tools:
+        tool.compute_all()
+    checkpoint.done()
@@ -1,13 +1,21 @@
 from math import floor, ceil
-from functools import lru_cache
-from collections import defaultdict
-from tools.rbf import RBF_times, RBF_val, StepList, merge_t_streams
-from util.helpers import MaxFinder
+from heapq import heappush, heappop
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from collections import namedtuple
+from tools.rbf import (RBF_dominant_times, RBF_val, RBF_below, StepList,
+                       Overload, burst, load, hyperperiod, line_crossings,
+                       merge_t_streams, LineCrossings)
+from util.helpers import MaxFinder, memoize, forget
+from util.trace import span, traced
 from . import base
 
 
 ERR = 1e-7
 
+FixedPoint = namedtuple('FixedPoint', 'nodes iterations residual')
+Admission = namedtuple('Admission', 'admitted flow node delay')
+
 
 class Node(base.Node):
     """FA model of a node."""
@@ -17,7 +25,21 @@ class Node(base.Node):
     def __init__(self, tool, node):
         super().__init__(tool, node)
 
-    @lru_cache(maxsize=None)
+    @property
+    @memoize
+    def H(self):
+        """Hyperperiod of the flows crossing the node."""
+        return hyperperiod(flow.T for flow in self.flows)
+
+    def _dominant_times(self, CTJs, start=0.0, CTJhp=()):
+        """Arrival times which may maximize the backlog, raising Overload
+        if it is unbounded."""
+        try:
+            return RBF_dominant_times(CTJs, self.H, start, CTJhp)
+        except Overload as error:
+            raise Overload(f'{error} in {self}') from None
+
+    @memoize
     def _get_CTJs(self, flows=None):
         """Get a collection of CTJ from a collection of flows."""
         CTJs = []
@@ -27,13 +49,20 @@ class Node(base.Node):
             CTJs.append((flow.C(self), flow.T, J))
         return tuple(CTJs)
 
-    @lru_cache(maxsize=None)
+    def linear_Bklg(self, jitters, *args):
+        """Upper bound of Bklg(*args) for given jitters of the flows, from
+        linear bounds of their rbf: cheap, and infinite if overloaded."""
+        CTJs = [(flow.C(self), flow.T, jitters[flow]) for flow in self.flows]
+        return burst(CTJs) if load(CTJs) < 1.0 else float('inf')
+
+    @memoize
+    @traced
     def Bklg(self):
         """Get the worst case backlog in a node."""
         CTJs = self._get_CTJs()
         bklg_max = MaxFinder(f'Bklg for {self}', 'µs')
 
-        for t in RBF_times(CTJs):
+        for t in self._dominant_times(CTJs):
             W = RBF_val(CTJs, t)
             bklg_max.check(W - t, t)
             if W < t:
@@ -48,6 +77,9 @@ class NodeSerial(Node):
     """FA model of a node, specialized for flow serialization."""
 
     suffix = '_s'
+    # Single sweep over the arrival and serialization instants, or the two
+    # passes of the original analysis (the two_pass engine of verify.py)
+    fused = True
 
     def _get_CTJs_by_src(self):
         """"Get for each source a collection of CTJs, with additionnal
@@ -60,54 +92,120 @@ class NodeSerial(Node):
             yield (src, (CTJs, max_C, rratio))
 
     @staticmethod
-    @lru_cache(maxsize=None)
-    def _get_stimes_by_src(rbfsx, CTJx, max_C, rratio):
-        """Find intersections times between rbfx and LinkRate curves."""
+    def _line(CTJx, max_C, rratio):
+        """Link rate line of a source, as arguments of line_crossings."""
         bklg = RBF_val(CTJx, 0) - max_C
         rate = rratio - sum(C / T for C, T, _ in CTJx)
         tmax = bklg / rate
+        return rratio, max_C, tmax
 
-        for W, t0, t1 in rbfsx:
-            if t0 > tmax:
-                break
-            t = (W - max_C) / rratio
-            if t0 <= t <= t1:
-                yield t
+    @classmethod
+    def _get_stimes_by_src(cls, rbfsx, *IPx):
+        """Find intersections times between rbfx and LinkRate curves."""
+        return line_crossings(rbfsx, *cls._line(*IPx))
 
     def _get_stimes(self, rbfs, IP):
         """Find intersections times for each input link."""
-        streams = [self._get_stimes_by_src(tuple(rbfsx), *IP[src])
+        streams = [self._get_stimes_by_src(rbfsx, *IP[src])
                    for src, rbfsx in rbfs.items()]
         yield from merge_t_streams(streams)
 
-    def _bklg(self, IP, times, bklg_max):
-        rbfs = defaultdict(StepList)
+    def _W(self, IP, t):
+        """Backlog bound W(t), and the rbf at t of each serialized source."""
+        W, rbfs = 0.0, []
+        for src, (CTJx, max_C, rratio) in IP.items():
+            rbfx = RBF_val(CTJx, t)
+            if src is self:  # No serialization
+                W += rbfx
+            else:
+                linkrate = rratio * t + max_C
+                W += min(rbfx, linkrate)
+                rbfs.append(rbfx)
+        return W, rbfs
+
+    def _bklg(self, W, IP, times, bklg_max):
+        rbfs = {src: StepList() for src in IP if src is not self}
         for t in times:
-            W = 0.0
-            for src, (CTJx, max_C, rratio) in IP.items():
-                rbfx = RBF_val(CTJx, t)
-                if src is self:  # No serialization
-                    W += rbfx
-                else:
-                    linkrate = rratio * t + max_C
-                    W += min(rbfx, linkrate)
-                    rbfs[src].append(t, rbfx)
-            bklg_max.check(W - t, t)
-            if W - t < ERR:
+            Wt, rbfx = W(t)
+            for steps, value in zip(rbfs.values(), rbfx):
+                steps.append(t, value)
+            bklg_max.check(Wt - t, t)
+            if Wt - t < ERR:
                 break
         return rbfs
 
-    @lru_cache(maxsize=None)
+    def _two_pass_bklg(self, W, IP, times, bklg_max, **span_args):
+        """Sweep the arrival times, keeping the staircases of the rbf of the
+        sources, then the instants where they meet the link rates. Critical
+        instants are sorted, once each: a crossing may be an arrival time."""
+        rbfs = self._bklg(W, IP, times, bklg_max)
+        with span('serialization', node=self, **span_args):
+            serial_times = self._get_stimes(rbfs, IP)
+            self._bklg(W, IP, serial_times, bklg_max)
+        bklg_max.times = sorted(set(bklg_max.times))
+
+    def _fused_bklg(self, W, IP, times, bklg_max):
+        """Sweep the arrival times, and the instants where the rbf of the
+        sources meet the link rates as their staircases are known, in
+        increasing order, as _two_pass_bklg, keeping only the current step
+        of each source."""
+        crossings = [LineCrossings(*self._line(*IPx))
+                     for src, IPx in IP.items() if src is not self]
+        serial_max = MaxFinder(bklg_max.desc, err=bklg_max.err)
+        pending, last, serial = [], None, True
+        values = starts = None
+
+        def sweep(t0, t1):
+            nonlocal last, serial
+            for k, crossing in enumerate(crossings):
+                for s in crossing.step(values[k], t0, t1, starts[k]):
+                    heappush(pending, s)
+            while serial and pending:
+                s = heappop(pending)
+                if s == last:
+                    continue
+                last = s
+                Ws, _ = W(s)
+                serial_max.check(Ws - s, s)
+                serial = Ws - s >= ERR
+
+        for t in times:
+            Wt, rbfx = W(t)
+            if values is None:
+                starts = [t] * len(rbfx)
+            else:
+                if serial:
+                    sweep(t0, t)
+                starts = [start if old == new else t for start, old, new
+                          in zip(starts, values, rbfx)]
+            values, t0 = rbfx, t
+            bklg_max.check(Wt - t, t)
+            if Wt - t < ERR:
+                break
+        if values is not None and serial:
+            sweep(t0, float('+inf'))
+
+        for s in serial_max.times:
+            bklg_max.check(serial_max.value, s)
+        bklg_max.times = sorted(set(bklg_max.times))
+
+    @memoize
+    @traced
     def Bklg(self):
         """Get the worst case backlog in a node with serialization."""
         CTJs = self._get_CTJs()
         IP = dict(self._get_CTJs_by_src())
         bklg_max = MaxFinder(f'Bklg for {self}', 'µs')
 
-        times = RBF_times(CTJs)
-        rbfs = self._bklg(IP, times, bklg_max)
-        serial_times = self._get_stimes(rbfs, IP)
-        self._bklg(IP, serial_times, bklg_max)
+        start = max((RBF_below(CTJx, rratio, max_C)
+                     for src, (CTJx, max_C, rratio) in IP.items()
+                     if src is not self), default=0.0)
+        times = self._dominant_times(CTJs, start)
+        W = partial(self._W, IP)
+        if self.fused:
+            self._fused_bklg(W, IP, times, bklg_max)
+        else:
+            self._two_pass_bklg(W, IP, times, bklg_max)
 
         self.export('res', ('bklg_b_s', 'times'), bklg_max.value, bklg_max.times)
         self.export('res', ('bklg_f_s', ), ceil(bklg_max.value / self.minC))
@@ -134,13 +232,32 @@ class NodePrio(Node):
                 CTJhp.append(CTJ)
         return WLP, tuple(CTJsp), tuple(CTJhp)
 
-    @lru_cache(maxsize=None)
+    def linear_Bklg(self, jitters, Ci, prio):
+        """Upper bound of Bklg(Ci, prio) for given jitters of the flows,
+        from linear bounds of their rbf: cheap, and infinite if overloaded.
+        With a load below 1, W(t) - t is largest at t = 0."""
+        WLP, CTJsp, CTJhp = 0.0, [], []
+        for flow in self.flows:
+            CTJ = flow.C(self), flow.T, jitters[flow]
+            if flow.prio > prio:
+                WLP = max(WLP, CTJ[0])
+            elif flow.prio == prio:
+                CTJsp.append(CTJ)
+            else:
+                CTJhp.append(CTJ)
+        U = load(CTJhp)
+        if U + load(CTJsp) >= 1.0:
+            return float('inf')
+        return (WLP + burst(CTJsp) + burst(CTJhp) - U * Ci) / (1 - U)
+
+    @memoize
+    @traced
     def Bklg(self, Ci, prio):
         """Get the worst case backlog in a node."""
         WLP, CTJsp, CTJhp = self._get_CTJs_by_prio(prio)
         bklg_max = MaxFinder(f'Bklg for {self} (P={prio})', 'µs')
 
-        for t in RBF_times(CTJsp):
+        for t in self._dominant_times(CTJsp, CTJhp=CTJhp):
             W_old, W = 0.0, Ci
             WLSP = WLP + RBF_val(CTJsp, t)
             while abs(W - W_old) > ERR:
@@ -149,14 +266,19 @@ class NodePrio(Node):
             if W - t < ERR:
                 break
 
-        self.export('res', ('bklg_b_p', 'times'), bklg_max.value, bklg_max.times)
-        self.export('res', ('bklg_f_p', ), ceil(bklg_max.value / self.minC))
+        self.export('res', ('bklg_b_p', 'times'), bklg_max.value, bklg_max.times,
+                    key=(Ci, prio))
+        self.export('res', ('bklg_f_p', ), ceil(bklg_max.value / self.minC),
+                    key=(Ci, prio))
         return bklg_max
 
 
 class NodePrioSerial(NodeSerial):
     """FA model of a node, with static priorities, specialized for flow serialization"""
     suffix = '_sp'
+    twin = None
+
+    linear_Bklg = NodePrio.linear_Bklg
 
     @staticmethod
     @lru_cache(maxsize=None)
@@ -192,31 +314,26 @@ class NodePrioSerial(NodeSerial):
 
         return WLP, CTJhp, CTJsp, IP
 
-    def _bklg(self, Ci, WLP, CTJhp, CTJsp, IP, times, bklg_max):
-        rbfs = defaultdict(StepList)
-        for t in times:
-            WSP = 0.0
-            for src, (CTJspx, CTJhpx, max_C, rratio) in IP.items():
-                rbfx = RBF_val(CTJspx, t)
-                if src is self:  # No serialization
-                    WSP += rbfx
-                else:
-                    linkrate = rratio * t + max_C - self._BHP(CTJhpx, t)
-                    WSP += min(rbfx, linkrate)
-                    rbfs[src].append(t, rbfx)
-            WLSP = WLP + WSP
-            W_old, W = 0.0, Ci
-            while abs(W - W_old) > ERR:
-                W_old, W = W, WLSP + RBF_val(CTJhp, W - Ci)
-            bklg_max.check(W - t, t)
-            if W - t < ERR:
-                break
-        return rbfs
+    def _W(self, Ci, WLP, CTJhp, IP, t):
+        """Backlog bound W(t), and the rbf at t of each serialized source."""
+        WSP, rbfs = 0.0, []
+        for src, (CTJspx, CTJhpx, max_C, rratio) in IP.items():
+            rbfx = RBF_val(CTJspx, t)
+            if src is self:  # No serialization
+                WSP += rbfx
+            else:
+                linkrate = rratio * t + max_C - self._BHP(CTJhpx, t)
+                WSP += min(rbfx, linkrate)
+                rbfs.append(rbfx)
+        WLSP = WLP + WSP
+        W_old, W = 0.0, Ci
+        while abs(W - W_old) > ERR:
+            W_old, W = W, WLSP + RBF_val(CTJhp, W - Ci)
+        return W, rbfs
 
     @staticmethod
-    @lru_cache(maxsize=None)
-    def _get_stimes_by_src(rbfsx, CTJspx, CTJhpx, max_C, rratio):
-        """Find intersections times between rbfx and LinkRate curves."""
+    def _line(CTJspx, CTJhpx, max_C, rratio):
+        """Link rate line of a source, as arguments of line_crossings."""
         bklg = (RBF_val(CTJspx, 0)
                 + sum(C for C, _, _ in CTJhpx)
                 - max_C)
@@ -224,53 +341,56 @@ class NodePrioSerial(NodeSerial):
                 - sum(C / T for C, T, _ in CTJspx)
                 - sum(C / T for C, T, _ in CTJhpx))
         tmax = bklg / rate
+        return rratio, max_C, tmax, CTJhpx
 
-        rbfhp0 = RBF_val(CTJhpx, 0.0)
+    @memoize
+    @traced
+    def Bklg(self, Ci, prio):
+        """Get the worst case backlog in a node with serialization.
 
-        for W, t0, t1 in rbfsx:
-            if t0 > tmax:
-                break
-            tau0 = 0.0
-            hp_times = RBF_times(CTJhpx) if CTJhpx else [float('+inf')]
-            for tau1 in hp_times:
-                if tau1 <= t0:
-                    continue
-                if tau0 >= min(tmax, t1):  # take tmax if t1 = +inf
-                    break
-                a, b = max(t0, tau0), min(t1, tau1)
-                rbfhp = RBF_val(CTJhpx, a)
-                t = (W - max_C + rbfhp - rbfhp0) / rratio
-                if a <= t <= b:
-                    yield t
-                tau0 = tau1
+        Flows all starting in the node are not serialized: the backlog is
+        then that of its twin without serialization, if any."""
+        if self.twin is not None and set(self.flows_by_src) == {self}:
+            bklg_max = self.twin.Bklg(Ci, prio)
+        else:
+            bklg_max = self._serial_Bklg(Ci, prio)
 
-    @lru_cache(maxsize=None)
-    def Bklg(self, Ci, prio):
-        """Get the worst case backlog in a node with serialization."""
-        WLP, CTJhp, CTJsp, IP = self._get_CTJs_by_src_and_prio(prio)
-        bklg_max = MaxFinder(f'Bklg for {self} (P={prio})', 'µs')
+        self.export('res', ('bklg_b_sp', 'times'), bklg_max.value, bklg_max.times,
+                    key=(Ci, prio))
+        self.export('res', ('bklg_f_sp', ), ceil(bklg_max.value / self.minC),
+                    key=(Ci, prio))
 
-        times = RBF_times(CTJsp)
-        rbfs = self._bklg(Ci, WLP, CTJhp, CTJsp, IP, times, bklg_max)
-        serial_times = self._get_stimes(rbfs, IP)
-        self._bklg(Ci, WLP, CTJhp, CTJsp, IP, serial_times, bklg_max)
+        return bklg_max
 
-        self.export('res', ('bklg_b_sp', 'times'), bklg_max.value, bklg_max.times)
-        self.export('res', ('bklg_f_sp', ), ceil(bklg_max.value / self.minC))
-        
-        print(self, bklg_max)
+    def _serial_Bklg(self, Ci, prio):
+        WLP, CTJhp, CTJsp, IP = self._get_CTJs_by_src_and_prio(prio)
+        bklg_max = MaxFinder(f'Bklg for {self} (P={prio})', 'µs')
 
+        start = max((RBF_below(CTJspx, rratio, max_C, CTJhpx)
+                     for src, (CTJspx, CTJhpx, max_C, rratio) in IP.items()
+                     if src is not self), default=0.0)
+        times = self._dominant_times(CTJsp, start, CTJhp)
+        W = partial(self._W, Ci, WLP, CTJhp, IP)
+        if self.fused:
+            self._fused_bklg(W, IP, times, bklg_max)
+        else:
+            self._two_pass_bklg(W, IP, times, bklg_max, prio=prio)
         return bklg_max
 
 
 class Flow(base.Flow):
     """FA model of a flow."""
 
+    def _node_Bklg_args(self, node):
+        """Arguments of the Bklg of a given node for current flow."""
+        return ()
+
     def _get_node_Bklg(self, node):
         """Get maximum Bklg for current flow in a given node."""
-        return node.Bklg()
+        return node.Bklg(*self._node_Bklg_args(node))
 
-    @lru_cache(maxsize=None)
+    @memoize
+    @traced
     def Sextr(self, node):
         """Get Smin and Smax in a node."""
         prev_node = self.prev(node)
@@ -285,6 +405,7 @@ class Flow(base.Flow):
 
         return Smax, Smin
 
+    @traced
     def R(self, node):
         """Compute the worst-case e2e delay R in a node."""
         Smax, Smin = self.Sextr(node)
@@ -299,9 +420,9 @@ class Flow(base.Flow):
 class FlowPrio(Flow):
     """FA model of a flow."""
 
-    def _get_node_Bklg(self, node):
-        """Get maximum Bklg for current flow in a given node."""
-        return node.Bklg(self.C(node), self.prio)
+    def _node_Bklg_args(self, node):
+        """Arguments of the Bklg of a given node for current flow."""
+        return self.C(node), self.prio
 
 
 class FA(base.Tool):
@@ -315,10 +436,13 @@ class FA(base.Tool):
         (True,  True):  (NodePrioSerial, FlowPrio),
     }
 
+    max_iterations = 100
+
     def __init__(self, config, serialization=True, prio=True):
         """Create FA computation model from config."""
         self.serialization = serialization
         self.prio = prio
+        self.fixed_points = []
         super().__init__(config, *FA.objTypes[(serialization, prio)])
 
     def __repr__(self):
@@ -326,8 +450,250 @@ class FA(base.Tool):
                 + (' with serialisation' if self.serialization else '')
                 + (' with static priorities' if self.prio else ''))
 
+    def _step(self, estimates):
+        """Compute the backlogs of a cycle of nodes from the jitters induced
+        by estimates of these backlogs."""
+        nodes = {node for node, _ in estimates}
+        for node in nodes:
+            forget(node)
+            for flow in node.flows:
+                flow.memo.pop(('Sextr', node), None)
+        for (node, args), bklg in estimates.items():
+            node.memo[('Bklg', *args)] = bklg
+        return {(node, args): type(node).Bklg.__wrapped__(node, *args)
+                for node, args in estimates}
+
+    def _solve(self, nodes):
+        """Find the backlogs of a cycle of nodes as the limit of a sequence
+        starting from null backlogs, each step using the jitters induced by
+        the previous one. Backlogs are only exported once converged, and
+        the solution replaces any former one for these nodes."""
+        estimates = {}
+        for node in nodes:
+            for flow in node.flows:
+                estimates[node, flow._node_Bklg_args(node)] = bklg = MaxFinder()
+                bklg.check(0.0, 0.0)
+
+        with self.muted():
+            for iteration in range(1, self.max_iterations + 1):
+                bklgs = self._step(estimates)
+                residual = max(abs(bklg.value - estimates[key].value)
+                               for key, bklg in bklgs.items())
+                estimates = bklgs
+                if residual < ERR:
+                    break
+            else:
+                raise ArithmeticError(f'No fixed point for the backlogs of '
+                                      f'{nodes} after {iteration} iterations')
+
+        for (node, args), bklg in self._step(estimates).items():
+            node.memo[('Bklg', *args)] = bklg
+            for flow in node.flows:
+                flow.memo.pop(('Sextr', node), None)
+        with self.lock:
+            self.fixed_points[:] = [fp for fp in self.fixed_points
+                                    if not set(fp.nodes) & set(nodes)]
+            self.fixed_points.append(FixedPoint(nodes, iteration, residual))
+
+    def _settle(self, nodes):
+        """Compute the backlogs of a set of nodes, once those of the nodes
+        upstream are known."""
+        if len(nodes) > 1 and not all(
+                ('Bklg', *flow._node_Bklg_args(node)) in node.memo
+                for node in nodes for flow in node.flows):
+            self._solve(nodes)
+        for node in nodes:
+            for flow in node.flows:
+                flow._get_node_Bklg(node)
+
+    @traced
+    def propagate(self):
+        """Compute the backlogs of all the nodes, upstream ones first, so
+        that no computation recurses further than the previous node of a
+        flow. Backlogs of cyclic dependent nodes are found as a fixed point.
+
+        >>> from conf.afdx import Configuration
+        >>> fa = FA(Configuration.from_mod_file('ring'), False, False)
+        >>> fa.propagate()
+        >>> [(len(fp.nodes), fp.iterations) for fp in fa.fixed_points]
+        [(3, 3)]
+        """
+        if self.threads > 1:
+            self.map_dependency_order(self._settle, self.threads)
+            return
+        for nodes in self.dependency_order():
+            self._settle(nodes)
+            self.tick()
+
+    def linear_delays(self):
+        """Upper bounds of the delay of each flow in each of its nodes, from
+        the linear bounds of the backlogs, infinite in cycles of nodes."""
+        S, delays = {}, {}
+        for nodes in self.dependency_order():
+            for node in nodes:
+                jitters = {}
+                for flow in node.flows:
+                    prev = flow.prev(node)
+                    if prev is node:
+                        S[flow, node] = 0.0, 0.0
+                    elif (flow, prev) in delays:
+                        Smin = S[flow, prev][1] + flow.C(prev) + node.L
+                        S[flow, node] = delays[flow, prev] + node.L, Smin
+                    else:  # Previous node in the same cycle
+                        S[flow, node] = float('inf'), 0.0
+                    jitters[flow] = S[flow, node][0] - S[flow, node][1]
+                for flow in node.flows:
+                    bklg = node.linear_Bklg(jitters,
+                                            *flow._node_Bklg_args(node))
+                    delays[flow, node] = S[flow, node][0] + bklg
+        return delays
+
+    @traced
+    def admit(self):
+        """Check that the delay of every flow is bounded by its deadline.
+
+        The linear delay bounds prove most flows in time: backlogs are only
+        computed in the nodes upstream of the others, upstream ones first,
+        stopping at the first flow whose bound exceeds its deadline. Return
+        the verdict, with that flow, node and delay bound if any.
+
+        >>> from conf.afdx import Configuration
+        >>> config = Configuration.from_mod_file('fpfifo')
+        >>> for vl in config.vls.values():
+        ...     vl.deadline = 500.0
+        >>> fa = FA(config)
+        >>> fa.admit(), sum(bool(node.memo) for node in fa.nodes.values())
+        (Admission(admitted=True, flow=None, node=None, delay=None), 0)
+        >>> config.vls[3].deadline = 300.0
+        >>> fa = FA(config)
+        >>> fa.admit().admitted, sum(bool(node.memo) for node in fa.nodes.values())
+        (True, 12)
+        >>> config.vls[7].deadline = 120.0
+        >>> FA(config).admit()
+        Admission(admitted=False, flow=VL(7), node=Port(S5 1), delay=132.0)
+        """
+        linear = self.linear_delays()
+        stack = [node for flow in self.flows.values() for node in flow
+                 if linear[flow, node] > flow._model.deadline]
+        upstream = set()
+        while stack:
+            node = stack.pop()
+            if node not in upstream:
+                upstream.add(node)
+                stack.extend(flow.prev(node) for flow in node.flows)
+
+        for nodes in self.dependency_order():
+            if nodes[0] not in upstream:  # Nor any node of its cycle
+                continue
+            self._settle(nodes)
+            for node in nodes:
+                for flow in node.flows:
+                    Smax, _ = flow.Sextr(node)
+                    delay = Smax + flow._get_node_Bklg(node).value
+                    if delay > flow._model.deadline:
+                        return Admission(False, flow, node, delay)
+            self.tick()
+        return Admission(True, None, None, None)
+
+    @staticmethod
+    def _delays(flow):
+        for node in flow:
+            flow.R(node)
+
+    def compute_all(self):
+        """Launch the computation for every node in each flow.
+
+        >>> from conf.afdx import Configuration
+        >>> from exporter.summary import Summary
+        >>> config = Configuration.from_mod_file('fpfifo')
+        >>> config.register(Summary)
+        >>> fa = FA(config)
+        >>> fa.threads = 4
+        >>> fa.compute_all()
+        >>> config.exporters[0].flows[3]
+        {'R_sp': 278.0}
+        """
+        self.propagate()
+        if self.threads > 1:
+            with ThreadPoolExecutor(self.threads) as pool:
+                for _ in pool.map(self._delays, self.flows.values()):
+                    pass
+        else:
+            for flow in self.flows.values():
+                self._delays(flow)
+
+
+class MultiFA():
+    """Several FA variants of a configuration, given as (serialization,
+    prio), computed together: each set of nodes, in dependency order, for
+    all the variants before the next one. Each variant has its own nodes and
+    flows: only the dependency order and the hyperperiods of the nodes are
+    computed once, and copied to the other variants, and, with static
+    priorities, the sweeps of the nodes where serialization changes nothing
+    are shared.
+
+    >>> from conf.afdx import Configuration
+    >>> config = Configuration.from_mod_file('fpfifo')
+    >>> fas = MultiFA(config)
+    >>> fas.compute_all()
+    >>> vl, port = config.vls[3], config.ports['S6 1']
+    >>> [fa.flows[vl].R(fa.nodes[port])[0] for fa in fas]
+    [188.0, 188.0, 288.0, 278.0]
+    >>> fas = [FA(config, *variant) for variant in FA.objTypes]
+    >>> [fa.flows[vl].R(fa.nodes[port])[0] for fa in fas]
+    [188.0, 188.0, 288.0, 278.0]
+    """
+
+    threads = 1
+
+    def __init__(self, config, variants=tuple(FA.objTypes)):
+        self.tools = {variant: FA(config, *variant) for variant in variants}
+        first, *others = self.tools.values()
+        order = first.dependency_order()
+        for tool in others:
+            tool.memo = {('dependency_order', ): [
+                [tool.nodes[node._model] for node in nodes]
+                for nodes in order]}
+            for node in first.nodes.values():
+                tool.nodes[node._model].memo[('H', )] = node.H
+        if (False, True) in self.tools and (True, True) in self.tools:
+            for node in self.tools[True, True].nodes.values():
+                node.twin = self.tools[False, True].nodes[node._model]
+
+    def __repr__(self):
+        return ' & '.join(map(repr, self))
+
+    def __getitem__(self, variant):
+        return self.tools[variant]
+
+    def __iter__(self):
+        return iter(self.tools.values())
+
+    def _settle(self, nodes):
+        for tool in self:
+            tool._settle([tool.nodes[node._model] for node in nodes])
+
+    def propagate(self):
+        """Compute the backlogs of all the nodes for every variant."""
+        if self.threads > 1:
+            first = next(iter(self))
+            first.map_dependency_order(self._settle, self.threads)
+            return
+        orders = [tool.dependency_order() for tool in self]
+        for sets in zip(*orders):
+            for tool, nodes in zip(self, sets):
+                tool._settle(nodes)
+                tool.tick()
+
     def compute_all(self):
-        """Launch the computation for every node in each flow."""
-        for flow in self.flows.values():
-            for node in flow:
-                flow.R(node)
+        """Launch the computation for every node in each flow, for every
+        variant."""
+        self.propagate()
+        flows = [flow for tool in self for flow in tool.flows.values()]
+        if self.threads > 1:
+            with ThreadPoolExecutor(self.threads) as pool:
+                for _ in pool.map(FA._delays, flows):
+                    pass
+        else:
+            for flow in flows:
+                FA._delays(flow)
@@ -0,0 +1,39 @@
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+from exporter.base import Recorder, replay
+
+
+def compute_tools(tools, threads=1):
+    """Run analyses in order, each in up to threads threads."""
+    for tool in tools:
+        tool.threads = threads
+        tool.compute_all()
+
+
+def compute_part(build, threads, part):
+    """Run the analyses built by build on a part of a configuration, and
+    return the events they exported."""
+    part.register(Recorder)
+    recorder = part.exporters[-1]
+    compute_tools(build(part), threads)
+    return recorder.events
+
+
+def compute_all(config, build, jobs=None, threads=1):
+    """Run the analyses built by build(config), a picklable callable
+    returning tools in the order in which to compute them.
+
+    Each independent part of the configuration is analysed in its own worker
+    process, with its own tools and caches; exported events are then
+    replayed in order into the exporters of config. Within a process, each
+    analysis runs in up to threads threads sharing its caches (see
+    tools.base.Tool), e.g. with jobs=1 on free-threaded builds of Python.
+    """
+    parts = [config] if jobs == 1 else config.partition()
+    if len(parts) < 2:
+        compute_tools(build(config), threads)
+        return
+
+    with ProcessPoolExecutor(jobs) as pool:
+        for events in pool.map(partial(compute_part, build, threads), parts):
+            replay(config, events)
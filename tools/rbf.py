@@ -1,5 +1,7 @@
-from math import floor
-from itertools import groupby, count
+from math import floor, gcd, lcm
+from fractions import Fraction
+from functools import reduce
+from itertools import groupby, count, takewhile
 from heapq import merge
 from operator import itemgetter
 
@@ -78,6 +80,57 @@ def RBF_times(CTJs):
     yield from merge_t_streams(RBFs)
 
 
+class Overload(ArithmeticError):
+    """The load of a set of flows is not below 1: their backlog is
+    unbounded."""
+
+
+def load(CTJs):
+    """Load of a set of flows, i.e. the long-term slope of their rbf.
+
+    >>> load(((15.0, 60.0, 80.0), (10.0, 50.0, 0.0)))
+    0.45
+    """
+    return sum(C / T for C, T, _ in CTJs)
+
+
+def burst(CTJs):
+    """Burst of a set of flows, so that their rbf is below
+    burst + load * t.
+
+    >>> burst(((15.0, 60.0, 30.0), (10.0, 50.0, 0.0)))
+    32.5
+    """
+    return sum(C * (1 + J / T) for C, T, J in CTJs)
+
+
+def RBF_dominant_times(CTJs, H, start=0.0, CTJhp=()):
+    """Finite stream of the arrival times of a set of flows which may
+    maximize W(t) - t, with the higher priority flows CTJhp adding to W.
+
+    If every period divides H and the rbf W has no other contribution after
+    `start`, then W(t + H) = W(t) + U * H there: with a load U < 1, any
+    instant later than start + H is dominated by the same instant one
+    hyperperiod earlier. Otherwise Overload is raised.
+
+    >>> flows = ((15.0, 60.0, 80.0), (10.0, 30.0, 0.0))
+    >>> list(RBF_dominant_times(flows, H=60.0))
+    [0.0, 30.0, 40.0]
+    >>> list(RBF_dominant_times(flows, H=60.0, start=30.0))
+    [0.0, 30.0, 40.0, 60.0]
+    >>> RBF_dominant_times(flows, H=60.0, CTJhp=((30.0, 60.0, 0.0), ))
+    ... # doctest: +IGNORE_EXCEPTION_DETAIL
+    Traceback (most recent call last):
+    ...
+    tools.rbf.Overload: Load 1.083 is not below 1
+    """
+    U = load(CTJs) + load(CTJhp)
+    if U >= 1.0:
+        raise Overload(f'Load {U:.4g} is not below 1')
+    horizon = start + H
+    return takewhile(horizon.__gt__, RBF_times(CTJs))
+
+
 def RBF_val(CTJs, t):
     """Compute a sum of rbf functions at time t.
 
@@ -92,6 +145,130 @@ def RBF_val(CTJs, t):
     return sum((1 + floor((t + J) / T)) * C for C, T, J in CTJs)
 
 
+def RBF_below(CTJs, rate, offset, CTJhp=()):
+    """Instant from which the rbf of a set of flows is guaranteed to stay
+    below the line rate * t + offset, minus the arrivals of higher priority
+    flows CTJhp after 0.
+
+    Uses rbf(t) <= rbf(0) + sum(C) + U * t, and the same kind of bound on
+    the higher priority arrivals.
+
+    >>> flows = ((10.0, 50.0, 0.0), (20.0, 100.0, 0.0))
+    >>> RBF_below(flows, rate=1.0, offset=30.0)
+    50.0
+    >>> RBF_below(flows, rate=1.0, offset=30.0, CTJhp=((30.0, 50.0, 0.0),))
+    inf
+    """
+    U = load(CTJs) + load(CTJhp)
+    excess = (RBF_val(CTJs, 0.0)
+              + sum(C for C, _, _ in CTJs)
+              + sum(C for C, _, _ in CTJhp)
+              - offset)
+    if rate <= U:
+        return float('+inf')
+    return max(0.0, excess / (rate - U))
+
+
+def line_crossings(steps, rate, offset, tmax, CTJhp=()):
+    """Instants where a staircase meets the line rate * t + offset, minus
+    the arrivals of higher priority flows CTJhp after 0, up to tmax.
+
+    The steps (value, start_time, end_time) and the higher priority arrival
+    times are walked in a single merged sweep.
+
+    >>> steps = StepList()
+    >>> steps.append(0.0, 20.0)
+    >>> steps.append(15.0, 30.0)
+    >>> steps.append(40.0, 40.0)
+    >>> list(line_crossings(steps, 1.0, 10.0, 100.0))
+    [10.0, 20.0]
+    >>> list(line_crossings(steps, 1.0, 10.0, 100.0, ((5.0, 25.0, 0.0),)))
+    [10.0, 20.0, 25.0]
+    """
+    crossings = LineCrossings(rate, offset, tmax, CTJhp)
+    for W, t0, t1 in steps:
+        yield from crossings.step(W, t0, t1)
+        if crossings.done:
+            break
+
+
+class LineCrossings():
+    """Instants where a staircase meets the line rate * t + offset, minus
+    the arrivals of higher priority flows CTJhp after 0, up to tmax, found
+    as the staircase is known: step by step, or in parts of steps, in order.
+
+    >>> crossings = LineCrossings(1.0, 10.0, 100.0, ((5.0, 25.0, 0.0),))
+    >>> crossings.step(20.0, 0.0, 12.0), crossings.step(30.0, 12.0, 22.0)
+    ([10.0], [20.0])
+    >>> crossings.step(30.0, 22.0, 30.0, start=12.0)
+    [25.0]
+    """
+
+    def __init__(self, rate, offset, tmax, CTJhp=()):
+        self.rate = rate
+        self.offset = offset
+        self.tmax = tmax
+        self.CTJhp = CTJhp
+        self.hp_times = RBF_times(CTJhp)
+        next(self.hp_times, None)  # Arrivals at 0 are part of the offset
+        self.hp0 = RBF_val(CTJhp, 0.0)
+        self.tau = next(self.hp_times, float('+inf'))
+        self.done = False  # A step started after tmax
+        self.ended = None  # Start of the last step walked up to tmax
+
+    def step(self, W, t0, t1, start=None):
+        """Crossings of the step of value W from t0 to t1, or of its part
+        from t0 to t1 if it started at start, before t0."""
+        start = t0 if start is None else start
+        if start > self.tmax:
+            self.done = True
+        if self.done or (start == self.ended and self.tau <= t0):
+            return []
+        inf = float('+inf')
+        while self.tau <= t0:
+            self.tau = next(self.hp_times, inf)
+        crossings = []
+        a = t0
+        while True:
+            t = (W - self.offset + RBF_val(self.CTJhp, a) - self.hp0) / self.rate
+            if a <= t <= min(t1, self.tau):
+                crossings.append(t)
+            if self.tau >= self.tmax:
+                self.ended = start
+            if self.tau >= min(self.tmax, t1):
+                return crossings
+            a, self.tau = self.tau, next(self.hp_times, inf)
+
+
+def hyperperiod(Ts):
+    """Least common multiple of a collection of periods.
+
+    Periods are taken as exact binary fractions: harmonic AFDX BAGs give a
+    small hyperperiod, non-commensurable periods a huge or infinite one.
+
+    >>> hyperperiod((80.0, 40.0, 160.0))
+    160.0
+    >>> hyperperiod((0.5, 0.75))
+    1.5
+    >>> hyperperiod(())
+    inf
+    """
+    def frac_lcm(a, b):
+        return Fraction(lcm(a.numerator, b.numerator),
+                        gcd(a.denominator, b.denominator))
+
+    Ts = set(Ts)
+    if not Ts:
+        return float('+inf')
+    if all(T.is_integer() for T in Ts):
+        return float(lcm(*map(int, Ts)))
+    Ts = map(Fraction, Ts)
+    try:
+        return float(reduce(frac_lcm, Ts))
+    except OverflowError:
+        return float('+inf')
+
+
 def merge_t_streams(streams):
     for t, _ in groupby(merge(*streams)):
         yield t
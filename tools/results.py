@@ -0,0 +1,180 @@
+"""Columnar tables of the results of a tool, filled as they are computed
+when an exporter reads them (see exporter.base.TableExporter).
+
+Rows have integer ids: one row for each node (port), and one for each hop,
+i.e. each node of each flow (VL). Each result (e.g. bklg_b_sp, bklg_f_sp,
+Smin, Smax or R_sp) is a column of ints or floats over the rows, along with
+the critical instants of each row if it has some.
+
+>>> from conf.afdx import Configuration
+>>> from tools.fa import FA
+>>> from exporter.base import TableExporter
+>>> config = Configuration.from_mod_file('fpfifo')
+>>> config.register(TableExporter)
+>>> fa = FA(config)
+>>> fa.compute_all()
+>>> results = fa.results
+>>> port = results.node_index['S6 1']
+>>> results.nodes['bklg_b_sp'][port], results.nodes['bklg_f_sp'][port]
+(50.0, 5)
+>>> hop = results.hop_index[3, 'S6 1']
+>>> results.hops['Smax'][hop], results.hops['R_sp'][hop]
+(108.0, 278.0)
+>>> results.hops['R_sp'].times(hop)
+[40.0, 90.0]
+>>> len(results.hops['R_sp'].values) == len(results.hop_flow)
+True
+"""
+
+import threading
+from math import isnan
+from array import array
+from conf.base import Flow, Node
+
+
+class Column():
+    """Values of a result in each row, as floats (NaN for None), and the
+    critical instants of each row, if kept, as slices of a flat array.
+
+    Values are all ints, or all floats, as the first one set:
+
+    >>> column = Column(2)
+    >>> column.set(0, 3)
+    >>> column[0], column[1]
+    (3, None)
+    >>> column.set(1, 2.5)
+    Traceback (most recent call last):
+    ...
+    TypeError: 2.5 in a column of int values
+    """
+
+    def __init__(self, size, instants=False):
+        self.values = array('d', bytes(8 * size))
+        self.present = bytearray(size)
+        self.integer = None  # Type of the values, once one is set
+        self.starts = array('q', bytes(8 * size)) if instants else None
+        self.ends = array('q', bytes(8 * size)) if instants else None
+        self.instants = array('d') if instants else None
+
+    def __contains__(self, row):
+        return bool(self.present[row])
+
+    def __getitem__(self, row):
+        """Value of a row, None if it has none."""
+        value = self.values[row]
+        if not self.present[row] or isnan(value):
+            return None
+        return int(value) if self.integer else value
+
+    def times(self, row):
+        """Critical instants of a row."""
+        return self.instants[self.starts[row]:self.ends[row]].tolist()
+
+    def set(self, row, value, times=None):
+        if value is None:
+            value = float('nan')
+        elif self.integer is None:
+            self.integer = isinstance(value, int)
+        elif isinstance(value, int) != self.integer:
+            raise TypeError(f'{value!r} in a column of '
+                            f'{"int" if self.integer else "float"} values')
+        self.values[row] = value
+        self.present[row] = 1
+        if times is not None:
+            self.starts[row] = len(self.instants)
+            self.instants.extend(times)
+            self.ends[row] = len(self.instants)
+
+
+class Columns(dict):
+    """Columns of results over some rows, by name, and the names of the
+    results exported together, e.g. ('R_sp', 'times'): times are the
+    critical instants of the first result."""
+
+    def __init__(self, size):
+        super().__init__()
+        self.size = size
+        self.groups = {}  # Ordered set
+
+    def set(self, row, names, values):
+        self.groups[names] = None
+        values = dict(zip(names, values))
+        times = values.pop('times', None)
+        for k, (name, value) in enumerate(values.items()):
+            if name not in self:
+                self[name] = Column(self.size, times is not None and k == 0)
+            self[name].set(row, value, times if k == 0 else None)
+
+    def get_row(self, row):
+        """Values of each group of results of a row, as exported."""
+        res = {}
+        for names in self.groups:
+            first = self[names[0]]
+            if row in first:
+                res[names] = [first.times(row) if name == 'times'
+                              else self[name][row] for name in names]
+        return res
+
+
+class Results():
+    """Tables of the results of a tool on a configuration: nodes, with a
+    row for each node, and hops, with a row for each node of each flow."""
+
+    def __init__(self, config):
+        self.node_ids = list(config.nodes)
+        self.node_index = {node_id: k
+                           for k, node_id in enumerate(self.node_ids)}
+        self.flow_ids = list(config.flows)
+        self.hop_flow = array('q')
+        self.hop_node = array('q')
+        self.hop_index = {}
+        for f, (flow_id, flow) in enumerate(config.flows.items()):
+            for node in flow:
+                self.hop_index[flow_id, node.node_id] = len(self.hop_flow)
+                self.hop_flow.append(f)
+                self.hop_node.append(self.node_index[node.node_id])
+        self.nodes = Columns(len(self.node_ids))
+        self.hops = Columns(len(self.hop_flow))
+        self.lock = threading.Lock()
+
+    def receive(self, fn, hook, obj, *args):
+        """Fill the tables with a result exported by a tool, if it is one:
+        a backlog of a node, or a delay of a flow in a node."""
+        if isinstance(obj, Node) and fn == 'Bklg' and hook == 'res':
+            names, *values = args
+            with self.lock:
+                self.nodes.set(self.node_index[obj.node_id], names, values)
+        elif isinstance(obj, Flow) and fn == 'R' and hook.startswith('res_'):
+            node, names, *values = args
+            with self.lock:
+                self.hops.set(self.hop_index[obj.flow_id, node.node_id],
+                              names, values)
+
+    def node_rows(self):
+        """Node ids and results of the nodes with results, by id."""
+        for k in sorted(range(len(self.node_ids)),
+                        key=self.node_ids.__getitem__):
+            res = self.nodes.get_row(k)
+            if res:
+                yield self.node_ids[k], res
+
+    def hop_rows(self):
+        """Flow and node ids and results of the hops with results, by ids."""
+        for key, k in sorted(self.hop_index.items()):
+            res = self.hops.get_row(k)
+            if res:
+                yield key, res
+
+    def update(self, other):
+        """Copy the results of another table which this one lacks."""
+        with self.lock:
+            for node_id, res in other.node_rows():
+                row = self.node_index[node_id]
+                for names, values in res.items():
+                    if row not in self.nodes.get(names[0], ()):
+                        self.nodes.set(row, names, values)
+            for key, res in other.hop_rows():
+                row = self.hop_index[key]
+                for names, values in res.items():
+                    if row not in self.hops.get(names[0], ()):
+                        self.hops.set(row, names, values)
@@ -0,0 +1,154 @@
+"""Sensitivity of the bounds of a configuration to the parameters of its
+flows: the largest frame size, or the smallest period, of a flow for which
+a constraint on the results of some tools still holds.
+
+>>> from functools import partial
+>>> from conf.afdx import Configuration
+>>> from batch import build
+>>> config = Configuration.from_mod_file('fpfifo')
+>>> for vl in config.vls.values():
+...     vl.deadline = 300.0
+>>> search = Search(config, partial(build, variants=['fa-sp']), Deadlines())
+>>> search.limit(3, 's_max', step=8.0)
+Limit(flow_id=3, param='s_max', value=1128.0, probes=5)
+>>> search.limit(3, 'T', step=1.0)
+Limit(flow_id=3, param='T', value=54.0, probes=4)
+>>> config.vls[3].s_max, config.vls[3].T
+(1000.0, 60.0)
+>>> limits(config, partial(build, variants=['fa-p', 'bd']), Backlogs(8),
+...        [1, 3], 's_max', step=8.0, jobs=1)  # doctest: +NORMALIZE_WHITESPACE
+[Limit(flow_id=1, param='s_max', value=1248.0, probes=6),
+ Limit(flow_id=3, param='s_max', value=1144.0, probes=6)]
+"""
+
+from math import ceil, floor
+from functools import partial
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from tools.bufdim import BufDim
+from tools.fa import FA
+
+Limit = namedtuple('Limit', 'flow_id param value probes')
+
+
+class Deadlines():
+    """Constraint: with every FA tool, the delay of each flow is bounded by
+    its deadline."""
+
+    def __call__(self, tools):
+        return all(tool.admit().admitted for tool in tools
+                   if isinstance(tool, FA))
+
+
+class Backlogs():
+    """Constraint: with every BufDim tool, the backlog of each node (of
+    node_ids, all by default) is at most limit frames."""
+
+    def __init__(self, limit, node_ids=None):
+        self.limit = limit
+        self.node_ids = node_ids
+
+    def __call__(self, tools):
+        for tool in tools:
+            if isinstance(tool, BufDim):
+                tool.comp.propagate()
+                for node in tool.nodes.values():
+                    if (self.node_ids is None
+                            or node._model.node_id in self.node_ids):
+                        if (node.Bklg().value or 0) > self.limit:
+                            return False
+        return True
+
+
+class Search():
+    """Bisection of the parameters of flows, one at a time, with the tools
+    built by build(config), for which satisfied(tools) must hold.
+
+    Bounds are assumed to grow with s_max and to shrink with T. Tools stay
+    warm between probes: each probe only recomputes the results of the
+    nodes downstream of the flow, and the results of the configuration are
+    restored once a search is over. Probes export nothing.
+    """
+
+    def __init__(self, config, build, satisfied):
+        self.config = config
+        self.tools = build(config)
+        self.satisfied = satisfied
+        for tool in self.tools:
+            tool.exporters = []
+
+    def _set(self, flow, param, value):
+        setattr(flow, param, float(value))
+        return [tool.invalidate((flow, )) for tool in self.tools]
+
+    def _other_load(self, flow, node):
+        return sum(other.C(node) / other.T for other in node
+                   if other is not flow)
+
+    def probe(self, flow, param, value):
+        """Whether the constraint holds once param of flow is value, which
+        never is the case if it overloads a node."""
+        self._set(flow, param, value)
+        if any(flow.C(node) / flow.T >= 1.0 - self._other_load(flow, node)
+               for node in flow):
+            return False
+        return self.satisfied(self.tools)
+
+    def limit(self, flow_id, param, step, bound=None):
+        """Largest s_max or smallest T of a flow, as a multiple of step from
+        its current value to bound, for which the constraint holds: None if
+        it does not hold with the current value."""
+        if param not in ('s_max', 'T'):
+            raise ValueError('Only s_max and T can be searched')
+        flow = self.config.flows[flow_id]
+        current = getattr(flow, param)
+        spare = [(1.0 - self._other_load(flow, node)) * node.R
+                 for node in flow]
+        if param == 's_max':
+            good = floor(current / step)
+            bad = ceil(min(spare) * flow.T / step)  # Overloading
+            if bound is not None:
+                bad = min(bad, floor(bound / step) + 1)
+        else:
+            good = ceil(current / step)
+            bad = floor(max(flow.s_max / s for s in spare) / step)
+            if bound is not None:
+                bad = max(bad, ceil(bound / step) - 1)
+
+        forgotten = self._set(flow, param, current)
+        probes = 1
+        try:
+            if not self.satisfied(self.tools):
+                return Limit(flow_id, param, None, probes)
+            while abs(bad - good) > 1:
+                middle = good + (bad - good) // 2
+                probes += 1
+                if self.probe(flow, param, middle * step):
+                    good = middle
+                else:
+                    bad = middle
+            value = max(current, good * step) if param == 's_max' else \
+                min(current, good * step)
+            return Limit(flow_id, param, value, probes)
+        finally:
+            self._set(flow, param, current)
+            for tool, results in zip(self.tools, forgotten):
+                tool.restore(results)
+
+
+def _limit(config, build, satisfied, param, step, bound, flow_id):
+    return Search(config, build, satisfied).limit(flow_id, param, step, bound)
+
+
+def limits(config, build, satisfied, flow_ids, param, step, bound=None,
+           jobs=None):
+    """Limits of several flows, searched independently in jobs worker
+    processes (all processors if None) unless jobs is 1. build and
+    satisfied must then be picklable."""
+    if jobs == 1:
+        search = Search(config, build, satisfied)
+        return [search.limit(flow_id, param, step, bound)
+                for flow_id in flow_ids]
+    with ProcessPoolExecutor(jobs) as pool:
+        return list(pool.map(partial(_limit, config, build, satisfied, param,
+                                     step, bound), flow_ids))
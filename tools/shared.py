@@ -0,0 +1,174 @@
+"""Flat, memory-mapped export of a compiled network, for worker processes.
+
+The ports, VLs, hops of each VL tree and dependency order of the ports are
+written as flat arrays in a single file, for the simulator (see tools.sim). Workers map it read-only: its arrays are memoryviews over the mapping,
+shared by all the processes through the page cache, so attaching costs the
+same whatever the size of the network, and nothing is parsed or copied.
+
+>>> from conf.afdx import Configuration
+>>> from tools.fa import FA
+>>> fa = FA(Configuration.from_mod_file('fifo'), False, False)
+>>> net = SharedNetwork.compile(fa)
+>>> with SharedNetwork.save(net) as path, SharedNetwork.map(path) as shared:
+...     p = shared.port_index('S4 1')
+...     shared.port_id(p), shared.R[p] == net.R[p], len(shared.hop_port)
+('S4 1', True, 27)
+"""
+
+import os
+import mmap
+from array import array
+from tempfile import mkstemp
+from contextlib import contextmanager
+
+# Flat arrays, in file order: port, flow and hop attributes, CSR indexes
+# (start of the rows of each port, flow or hop) and their rows.
+SECTIONS = (
+    ('R', 'd'),           # Rate of each port
+    ('L', 'd'),           # Latency before each port
+    ('T', 'd'),           # Period of each flow
+    ('s_max', 'd'),       # Maximum frame size of each flow
+    ('s_min', 'd'),       # Minimum frame size of each flow
+    ('prio', 'q'),        # Priority of each flow
+    ('flow_hops', 'q'),   # First hop of each flow (hops are grouped by flow)
+    ('hop_flow', 'q'),    # Flow of each hop
+    ('hop_port', 'q'),    # Port of each hop
+    ('hop_src', 'q'),     # Previous hop of each hop, or -1
+    ('hop_nexts', 'q'),   # First next hop of each hop, in next_hop
+    ('next_hop', 'q'),
+    ('sccs', 'q'),        # First port of each set of ports, in scc_port
+    ('scc_port', 'q'),    # Ports in dependency order, upstream ones first
+    ('port_names', 'q'),  # First byte of the id of each port, in names
+    ('flow_names', 'q'),  # First byte of the id of each flow, in names
+    ('names', 'B'),
+)
+HEADER = 2 * len(SECTIONS) * 8
+
+
+class SharedNetwork():
+    """Flat arrays of a compiled network (see SECTIONS): in memory once
+    compiled, or memoryviews over a mapped file."""
+
+    def __init__(self, sections, mapping=None):
+        self.mapping = mapping
+        for name, _ in SECTIONS:
+            setattr(self, name, sections[name])
+
+    @classmethod
+    def compile(cls, tool):
+        """Compile the configuration of a tool, with its dependency order."""
+        sections = {name: array(typecode) for name, typecode in SECTIONS}
+        nodes, flows = list(tool.nodes.values()), list(tool.flows.values())
+        index = {node._model: p for p, node in enumerate(nodes)}
+        names = bytearray()
+
+        for node in nodes:
+            sections['R'].append(node.R)
+            sections['L'].append(node.L)
+            sections['port_names'].append(len(names))
+            names += str(node._model.node_id).encode()
+        sections['port_names'].append(len(names))
+
+        for f, flow in enumerate(flows):
+            model = flow._model
+            sections['T'].append(flow.T)
+            sections['s_max'].append(model.s_max)
+            sections['s_min'].append(model.s_min)
+            sections['prio'].append(flow.prio)
+            sections['flow_names'].append(len(names))
+            names += str(model.flow_id).encode()
+            first = len(sections['hop_port'])
+            sections['flow_hops'].append(first)
+            hops = {node: first + h for h, node in enumerate(model.sources)}
+            for node, src in model.sources.items():
+                sections['hop_flow'].append(f)
+                sections['hop_port'].append(index[node])
+                sections['hop_src'].append(-1 if src is None else hops[src])
+                sections['hop_nexts'].append(len(sections['next_hop']))
+                sections['next_hop'].extend(sorted(
+                    hops[dest] for dest in model.paths.get(node, ())))
+        sections['flow_names'].append(len(names))
+        sections['flow_hops'].append(len(sections['hop_port']))
+        sections['hop_nexts'].append(len(sections['next_hop']))
+        sections['names'].frombytes(names)
+
+        for scc in tool.dependency_order():
+            sections['sccs'].append(len(sections['scc_port']))
+            sections['scc_port'].extend(index[node._model] for node in scc)
+        sections['sccs'].append(len(sections['scc_port']))
+        return cls(sections)
+
+    @staticmethod
+    @contextmanager
+    def save(net, path=None):
+        """Write a compiled network to a file (a temporary one by default),
+        removed on exit."""
+        if path is None:
+            fd, path = mkstemp(prefix='anafor-', suffix='.net')
+            os.close(fd)
+        header = array('q')
+        offset = HEADER
+        for name, _ in SECTIONS:
+            section = getattr(net, name)
+            header.extend((offset, len(section)))
+            offset += -(-len(section) * section.itemsize // 8) * 8
+        try:
+            with open(path, 'wb') as f:
+                f.write(header.tobytes())
+                for name, _ in SECTIONS:
+                    data = getattr(net, name).tobytes()
+                    f.write(data + bytes(-len(data) % 8))
+            yield path
+        finally:
+            os.remove(path)
+
+    @classmethod
+    @contextmanager
+    def map(cls, path):
+        """Map a saved network read-only, without copying it."""
+        net = cls.attach(path)
+        try:
+            yield net
+        finally:
+            net.close()
+
+    @classmethod
+    def attach(cls, path):
+        """Map a saved network read-only, until close()."""
+        with open(path, 'rb') as f:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        buffer = memoryview(mapping)
+        header = buffer[:HEADER].cast('q')
+        sections = {}
+        for k, (name, typecode) in enumerate(SECTIONS):
+            offset, length = header[2 * k], header[2 * k + 1]
+            size = array(typecode).itemsize
+            sections[name] = buffer[offset:offset + length * size].cast(typecode)
+        return cls(sections, mapping)
+
+    def close(self):
+        """Release the mapping, if any."""
+        if self.mapping is not None:
+            for name, _ in SECTIONS:
+                getattr(self, name).release()
+            self.mapping.close()
+            self.mapping = None
+
+    def _name(self, starts, k):
+        return bytes(self.names[starts[k]:starts[k + 1]]).decode()
+
+    def port_id(self, p):
+        return self._name(self.port_names, p)
+
+    def flow_id(self, f):
+        """Id of a flow, as text."""
+        return self._name(self.flow_names, f)
+
+    def port_index(self, port_id):
+        return next(p for p in range(len(self.R))
+                    if self.port_id(p) == port_id)
+
+    def order(self):
+        """Sets of ports in dependency order, upstream ones first."""
+        return [self.scc_port[self.sccs[k]:self.sccs[k + 1]]
+                for k in range(len(self.sccs) - 1)]
@@ -0,0 +1,310 @@
+import heapq
+from array import array
+from math import isinf
+from random import Random
+from itertools import count
+from functools import partial
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from tools.rbf import hyperperiod
+from tools.shared import SharedNetwork
+from util.helpers import MaxFinder
+from . import base
+
+# Event kinds, in processing order at a given instant
+DEPART, ARRIVE = 0, 1
+
+
+class Frames():
+    """Columns of the frames released by each flow f at offset + k * T[f]
+    until duration, for a batch of scenarios of offsets: scenario, flow and
+    release instant (from the start of the scenario)."""
+
+    def __init__(self, T, duration, scenarios):
+        self.scenario = array('l')
+        self.flow = array('l')
+        self.release = array('d')
+        for s, offsets in enumerate(scenarios):
+            for f, offset in enumerate(offsets):
+                releases = array('d', (offset + k * T[f] for k in range(
+                    max(0, int((duration - offset) // T[f]) + 1))))
+                while releases and releases[-1] >= duration:
+                    releases.pop()
+                self.scenario.extend([s] * len(releases))
+                self.flow.extend([f] * len(releases))
+                self.release.extend(releases)
+
+    def __len__(self):
+        return len(self.flow)
+
+
+def serve(ports, arrivals, net, prio, frames, results):
+    """Serve the frames arriving as (scenario, instant, frame, hop) at a set
+    of ports depending on each other only, through non-preemptive FIFO or
+    static priority queues, scenario after scenario.
+
+    Simultaneous arrivals are queued in frame order. Update results with
+    the backlogs and delays observed in these ports, and return the
+    departures from them, as (scenario, instant, frame, hop) leaving the
+    set.
+    """
+    R, L, s_max, P = net.R, net.L, net.s_max, net.prio
+    hop_port, hop_nexts, next_hop = net.hop_port, net.hop_nexts, net.next_hop
+    bklg, max_frames, delays = results
+    scenario, flow, release = frames.scenario, frames.flow, frames.release
+    seq = count()
+    events = [(s, t, ARRIVE, k, h) for s, t, k, h in arrivals]
+    heapq.heapify(events)
+    queues = {p: [] for p in ports}
+    busy = dict.fromkeys(ports, False)
+    work_end = dict.fromkeys(ports, 0.0)
+    waiting = dict.fromkeys(ports, 0)
+    current = dict.fromkeys(ports, -1)
+    departures = []
+
+    while events:
+        s, t, kind, k, h = heapq.heappop(events)
+        f, p = flow[k], hop_port[h]
+        if kind == DEPART:
+            waiting[p] -= 1
+            delay = t - release[k]
+            if delay > delays.get(h, (-1.0, ))[0]:
+                delays[h] = delay, release[k]
+            for g in next_hop[hop_nexts[h]:hop_nexts[h + 1]]:
+                q = hop_port[g]
+                if q in queues:
+                    heapq.heappush(events, (s, t + L[q], ARRIVE, k, g))
+                else:
+                    departures.append((s, t + L[q], k, g))
+            busy[p] = False
+        else:
+            if current[p] != s:  # Every queue is empty between scenarios
+                current[p], work_end[p] = s, 0.0
+            work_end[p] = max(work_end[p], t) + s_max[f] / R[p]
+            if work_end[p] - t > bklg[p][0]:
+                bklg[p] = work_end[p] - t, t
+            waiting[p] += 1
+            max_frames[p] = max(max_frames[p], waiting[p])
+            heapq.heappush(queues[p], (P[f] if prio else 0, next(seq), k, h))
+        if not busy[p] and queues[p]:
+            _, _, k, h = heapq.heappop(queues[p])
+            busy[p] = True
+            heapq.heappush(events, (scenario[k], t + s_max[flow[k]] / R[p],
+                                    DEPART, k, h))
+    return departures
+
+
+def sweep(p, arrivals, net, prio, frames, results):
+    """Same as serve for a single port which is not in a cycle, all its
+    arrivals being known: sweep them in order, without events."""
+    R, L, s_max, P = net.R, net.L, net.s_max, net.prio
+    hop_port, hop_nexts, next_hop = net.hop_port, net.hop_nexts, net.next_hop
+    bklg, max_frames, delays = results
+    flow, release = frames.flow, frames.release
+    queue, sent, departures = [], deque(), []
+    s, t_free, work_end = -1, 0.0, 0.0
+    i, n = 0, len(arrivals)
+    while i < n or queue:
+        last = i  # Frames arrived before the end of the last transmission
+        while last < n and arrivals[last][0] == s and arrivals[last][1] < t_free:
+            last += 1
+        if last == i and not queue:  # Idle, until the next arrival
+            if arrivals[i][0] != s:  # Every queue is empty between scenarios
+                s, work_end = arrivals[i][0], 0.0
+                sent.clear()
+            t_free, last = arrivals[i][1], i + 1
+        for j in range(i, last):
+            _, t, k, h = arrivals[j]
+            f = flow[k]
+            work_end = max(work_end, t) + s_max[f] / R[p]
+            if work_end - t > bklg[p][0]:
+                bklg[p] = work_end - t, t
+            while sent and sent[0] <= t:
+                sent.popleft()
+            max_frames[p] = max(max_frames[p], len(queue) + len(sent) + 1)
+            heapq.heappush(queue, (P[f] if prio else 0, j, k, h))
+        i = last
+        _, _, k, h = heapq.heappop(queue)
+        t_free += s_max[flow[k]] / R[p]
+        sent.append(t_free)
+        delay = t_free - release[k]
+        if delay > delays.get(h, (-1.0, ))[0]:
+            delays[h] = delay, release[k]
+        for g in next_hop[hop_nexts[h]:hop_nexts[h + 1]]:
+            departures.append((s, t_free + L[hop_port[g]], k, g))
+    return departures
+
+
+_attached = {}
+
+
+def simulate(net, prio, duration, scenarios):
+    """Simulate a batch of scenarios of flow offsets in a network (a
+    SharedNetwork, or the path of a saved one, mapped once per process),
+    serving each set of ports once for the whole batch, in dependency order.
+
+    Return the maximum backlog (µs and instant) and maximum number of frames
+    of each port, and the maximum delay from release to the end of
+    transmission (and release instant) of each hop of the flows.
+    """
+    if isinstance(net, str):
+        if net not in _attached:
+            _attached[net] = SharedNetwork.attach(net)
+        net = _attached[net]
+    flow_hops, hop_src, hop_port = net.flow_hops, net.hop_src, net.hop_port
+    firsts = [[h for h in range(flow_hops[f], flow_hops[f + 1])
+               if hop_src[h] < 0] for f in range(len(net.T))]
+    frames = Frames(net.T, duration, scenarios)
+    results = [(0.0, 0.0)] * len(net.R), [0] * len(net.R), {}
+    pending = defaultdict(list)
+    for k in range(len(frames)):
+        for h in firsts[frames.flow[k]]:
+            pending[hop_port[h]].append((frames.scenario[k],
+                                         frames.release[k], k, h))
+    for ports in net.order():
+        arrivals = sorted(arrival for p in ports
+                          for arrival in pending.pop(p, ()))
+        if len(ports) == 1:
+            departures = sweep(*ports, arrivals, net, prio, frames, results)
+        else:
+            departures = serve(set(ports), arrivals, net, prio, frames,
+                               results)
+        for departure in departures:
+            pending[hop_port[departure[-1]]].append(departure)
+    return results
+
+
+class Node(base.Node):
+    """Simulated port."""
+
+    suffix = '_sim'
+
+    def __init__(self, tool, node):
+        super().__init__(tool, node)
+        self.bklg = MaxFinder(f'Bklg for {self} sim', 'µs')
+        self.frames = 0
+
+    def Bklg(self):
+        """Export the worst observed backlog in the port."""
+        self.export('res', (f'bklg_b{self.suffix}', 'times'),
+                    self.bklg.value, self.bklg.times)
+        self.export('res', (f'bklg_f{self.suffix}', ), self.frames)
+        return self.bklg
+
+
+class NodePrio(Node):
+    """Simulated port, with static priorities."""
+
+    suffix = '_sim_p'
+
+
+class Flow(base.Flow):
+    """Simulated flow."""
+
+    def __init__(self, tool, flow):
+        super().__init__(tool, flow)
+        self.delays = {}
+
+    def R(self, node):
+        """Export the worst observed delay from release to the end of
+        transmission in a port, and release instants reaching it."""
+        R = self.delays.get(node, MaxFinder())
+        self.export('res_R', node._model, (f'R{node.suffix}', 'times'),
+                    R.value, R.times)
+        return R.value, R.times
+
+
+class Sim(base.Tool):
+    """Discrete-event simulation of a network configuration, for many
+    scenarios of flow offsets: the first one releases all the flows at 0,
+    the others at random offsets within their periods.
+
+    Scenarios are simulated by batches: the ports are served in dependency
+    order, each (or each cycle of ports) once for all the frames of a
+    batch. Batches are simulated in jobs worker processes (all processors
+    if None) unless jobs is 1.
+
+    Frames always have their maximum size. Observed delays and backlogs are
+    lower bounds of the worst cases, to compare with FA and BufDim.
+
+    >>> from conf.afdx import Configuration
+    >>> config = Configuration.from_mod_file('fifo')
+    >>> sim = Sim(config, prio=False, scenarios=10)
+    >>> sim.compute_all()
+    >>> vl = sim.flows[config.vls[1]]
+    >>> [(node, round(vl.R(node)[0], 1)) for node in vl]
+    [(Port(ES1 1), 28.0), (Port(S1 2), 64.0), (Port(S4 1), 107.3)]
+    """
+
+    objTypes = {
+        # prio: (NodeType, FlowType)
+        False: (Node,     Flow),
+        True:  (NodePrio, Flow),
+    }
+
+    def __init__(self, config, prio=True, scenarios=100, duration=None,
+                 seed=0, batch=10, jobs=1):
+        """Simulate each scenario until duration, by default twice the
+        hyperperiod of the flows (ten times their largest period if they
+        have none) after their largest period."""
+        self.prio = prio
+        self.scenarios = scenarios
+        self.seed = seed
+        self.batch = batch
+        self.jobs = jobs
+        super().__init__(config, *Sim.objTypes[prio])
+        Ts = [flow.T for flow in self.flows.values()]
+        H = hyperperiod(Ts)
+        self.duration = (max(Ts) + (10 * max(Ts) if isinf(H) else 2 * H)
+                         if duration is None else duration)
+
+    def __repr__(self):
+        return (super().__repr__()
+                + (' with static priorities' if self.prio else ''))
+
+    def offsets(self):
+        """Offsets of the flows in each scenario."""
+        rng = Random(self.seed)
+        Ts = [flow.T for flow in self.flows.values()]
+        yield [0.0] * len(Ts)
+        for _ in range(self.scenarios - 1):
+            yield [rng.uniform(0.0, T) for T in Ts]
+
+    def batches(self):
+        offsets = list(self.offsets())
+        for k in range(0, len(offsets), self.batch):
+            yield offsets[k:k + self.batch]
+
+    def compute_all(self):
+        """Simulate all the scenarios, then export the worst observations.
+
+        Worker processes map the compiled network from a shared file rather
+        than receiving a copy of it with each batch."""
+        net = SharedNetwork.compile(self)
+        if self.jobs == 1:
+            self.merge(net, map(partial(simulate, net, self.prio,
+                                        self.duration), self.batches()))
+        else:
+            with SharedNetwork.save(net) as path, \
+                    ProcessPoolExecutor(self.jobs) as pool:
+                self.merge(net, pool.map(partial(simulate, path, self.prio,
+                                                 self.duration),
+                                         self.batches()))
+
+        for node in self.nodes.values():
+            node.Bklg()
+        for flow in self.flows.values():
+            for node in flow:
+                flow.R(node)
+
+    def merge(self, net, results):
+        """Merge the worst observations of batches of scenarios."""
+        flows, nodes = list(self.flows.values()), list(self.nodes.values())
+        for bklg, frames, delays in results:
+            for node, (value, t), n in zip(nodes, bklg, frames):
+                node.bklg.check(value, t)
+                node.frames = max(node.frames, n)
+            for h, (value, release) in delays.items():
+                node = nodes[net.hop_port[h]]
+                R = flows[net.hop_flow[h]].delays.setdefault(node, MaxFinder())
+                R.check(value, release)
@@ -1,3 +1,8 @@
+import functools
+from functools import wraps
+from threading import RLock
+
+
 class MaxFinder():
     def __init__(self, desc='Maximum value', unit=None, err=1e-7):
         self.unit = ' (%s)' % unit if unit else ''
@@ -25,3 +30,58 @@ class MaxFinder():
 
 def list_str(iterable, formater='{:g}', sep=','):
     return sep.join(map(formater.format, iterable))
+
+
+def memoize(method):
+    """Cache the results of a method in the memo dict of its instance,
+    by method name and arguments.
+
+    Safe to call from several threads: a result missing from the memo is
+    computed once, other threads waiting for it. Each result has its own
+    lock, so that computations depending on one another never deadlock.
+    """
+    name = method.__name__
+
+    @wraps(method)
+    def memoized(self, *args):
+        memo = self.__dict__.setdefault('memo', {})
+        key = (name, *args)
+        try:
+            return memo[key]
+        except KeyError:
+            pass
+        locks = self.__dict__.setdefault('memo_locks', {})
+        with locks.setdefault(key, RLock()):
+            try:
+                return memo[key]
+            except KeyError:
+                value = memo[key] = method(self, *args)
+                locks.pop(key, None)
+                return value
+
+    return memoized
+
+
+class cached_property(functools.cached_property):
+    """functools.cached_property, computed once even if several threads
+    get it at the same time."""
+
+    def __init__(self, func):
+        super().__init__(func)
+        self.lock = RLock()
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        try:
+            return instance.__dict__[self.attrname]
+        except KeyError:
+            with self.lock:
+                return super().__get__(instance, owner)
+
+
+def forget(obj, *names):
+    """Drop the memoized results of some methods (all if none) of obj."""
+    memo = obj.__dict__.get('memo', {})
+    for key in [key for key in memo if not names or key[0] in names]:
+        del memo[key]
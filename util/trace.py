@@ -0,0 +1,96 @@
+"""Optional timeline tracing, written in Chrome trace format (for
+chrome://tracing or Perfetto).
+
+Spans cost a single test while tracing is disabled.
+
+>>> enable()
+>>> @traced
+... def double(x):
+...     with span('inner', x=x):
+...         return 2 * x
+>>> double(21)
+42
+>>> [(event['name'], event['args']) for event in disable()]
+[('inner', {'x': '21'}), ('util.trace.double', {'args': '21'})]
+"""
+
+import os
+import json
+import threading
+from time import perf_counter_ns
+from functools import wraps
+from contextlib import contextmanager, nullcontext
+
+tracer = None
+NULL = nullcontext()
+
+
+class Tracer():
+    """Collection of complete events, with times in µs."""
+
+    def __init__(self):
+        self.events = []
+        self.pid = os.getpid()
+
+    def add(self, name, start, end, args):
+        self.events.append({
+            'name': name,
+            'ph': 'X',
+            'ts': start / 1000,
+            'dur': (end - start) / 1000,
+            'pid': self.pid,
+            'tid': threading.get_ident(),
+            'args': {key: value if isinstance(value, str) else repr(value)
+                     for key, value in args.items()},
+        })
+
+
+def enable():
+    """Start tracing, dropping any former trace."""
+    global tracer
+    tracer = Tracer()
+
+
+def disable(path=None):
+    """Stop tracing, write the trace to path if any, and return its
+    events."""
+    global tracer
+    events, tracer = ([], None) if tracer is None else (tracer.events, None)
+    if path is not None:
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+    return events
+
+
+@contextmanager
+def _span(name, args):
+    start = perf_counter_ns()
+    try:
+        yield
+    finally:
+        if tracer is not None:
+            tracer.add(name, start, perf_counter_ns(), args)
+
+
+def span(name, **args):
+    """Context manager tracing a span, with some arguments."""
+    return NULL if tracer is None else _span(name, args)
+
+
+class ReprArgs(tuple):
+    def __repr__(self):
+        return ', '.join(map(repr, self))
+
+
+def traced(function):
+    """Trace each call of a function as a span, with its arguments."""
+    name = f'{function.__module__}.{function.__qualname__}'
+
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        if tracer is None:
+            return function(*args, **kwargs)
+        with _span(name, {'args': ReprArgs(args)}):
+            return function(*args, **kwargs)
+
+    return wrapper
@@ -0,0 +1,208 @@
+"""Check that alternative analysis engines give the same bounds as the
+reference one, on shipped and generated configurations, and time them.
+
+    python verify.py assets/fifo.mod assets/fpfifo.mod -g 5 -e multi parallel
+
+The reference engine computes one tool per analysis variant in turn, with
+the FA analyses as they were first written (see tools.reference): every
+arrival time is a candidate instant, and jitters are computed by recursion
+over the previous ports. Configurations whose ports depend on one another
+in a cycle have no reference, and are reported as skipped. Other engines
+are named below, or given as module:function taking the configuration and
+the variants. The worst delay of each VL and backlogs of each port must
+match the reference within a relative tolerance.
+"""
+
+import sys
+import json
+import time
+import argparse
+import importlib
+from pathlib import Path
+from functools import partial
+import conf.afdx
+import tools.parallel
+from batch import FA_VARIANTS, BUFDIM_VARIANTS, build, expand
+from exporter.summary import Summary
+import tools.reference
+from tools.bufdim import BufDim
+from tools.fa import MultiFA
+
+
+def reference(config, variants):
+    fa = None
+    for variant in variants:
+        if variant in FA_VARIANTS:
+            fa = tools.reference.FA(config, *FA_VARIANTS[variant])
+            fa.compute_all()
+        elif variant in BUFDIM_VARIANTS:
+            BufDim(config, fa, BUFDIM_VARIANTS[variant]).compute_all()
+
+
+def fused(config, variants):
+    """The analyses of batch.py, with the single-pass serialization sweep,
+    and backlogs computed in dependency order."""
+    for tool in build(config, variants):
+        tool.compute_all()
+
+
+def two_pass(config, variants):
+    """As fused, with the two-pass serialization sweep."""
+    for tool in build(config, variants):
+        for node in tool.nodes.values():
+            node.fused = False
+        tool.compute_all()
+
+
+def multi(config, variants):
+    """FA variants computed together, then BufDim variants."""
+    fas = MultiFA(config, [FA_VARIANTS[variant] for variant in variants
+                           if variant in FA_VARIANTS])
+    fas.compute_all()
+    fa = None
+    for variant in variants:
+        if variant in FA_VARIANTS:
+            fa = fas[FA_VARIANTS[variant]]
+        elif variant in BUFDIM_VARIANTS:
+            BufDim(config, fa, BUFDIM_VARIANTS[variant]).compute_all()
+
+
+def parallel(config, variants):
+    """Independent parts of the configuration in worker processes."""
+    tools.parallel.compute_all(config, partial(build, variants=variants))
+
+
+def threads(config, variants):
+    """Independent nodes in threads, sharing the caches of each analysis."""
+    tools.parallel.compute_tools(build(config, variants), threads=8)
+
+
+ENGINES = {
+    'reference': reference,
+    'fused': fused,
+    'two_pass': two_pass,
+    'multi': multi,
+    'parallel': parallel,
+    'threads': threads,
+}
+
+
+def engine(name):
+    if name in ENGINES:
+        return ENGINES[name]
+    module, _, function = name.partition(':')
+    return getattr(importlib.import_module(module), function)
+
+
+def run(engine, load, variants, repeat=1):
+    """Summary of the results of an engine on the configuration given by
+    load(), and its best runtime (s) over repeat fresh runs."""
+    best = float('inf')
+    for _ in range(repeat):
+        config = load()
+        config.register(Summary)
+        start = time.perf_counter()
+        engine(config, variants)
+        best = min(best, time.perf_counter() - start)
+    return config.exporters[-1].as_dict(), best
+
+
+def differences(expected, results, tolerance):
+    """Results missing, unexpected or differing from the expected ones by
+    more than tolerance (relative, absolute below 1), as (kind, id, column,
+    expected, result)."""
+    diffs = []
+    for kind in ('flows', 'nodes'):
+        keys = {(key, col) for key, cols in expected[kind].items()
+                for col in cols}
+        keys |= {(key, col) for key, cols in results[kind].items()
+                 for col in cols}
+        for key, col in sorted(keys, key=repr):
+            value = expected[kind].get(key, {}).get(col)
+            result = results[kind].get(key, {}).get(col)
+            if (value is None or result is None
+                    or abs(result - value) > tolerance * max(1.0, abs(value))):
+                diffs.append((kind, key, col, value, result))
+    return diffs
+
+
+def configurations(args):
+    """Names and loaders of the configurations to check."""
+    for path in expand(args.mod):
+        yield path, partial(conf.afdx.Configuration.from_mod_file,
+                            Path(path).stem, args.latency, path=path)
+    for seed in range(args.generate):
+        yield f'random{seed}', partial(
+            conf.afdx.Configuration.generate, seed=seed,
+            es_count=max(12, args.vls // 5), switch_count=max(6, args.vls // 20),
+            vl_count=args.vls, latency=args.latency)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('mod', nargs='*',
+                        default=['assets/fifo.mod', 'assets/fpfifo.mod'],
+                        help='.mod configuration files, or globs of them')
+    parser.add_argument('-g', '--generate', type=int, default=0,
+                        help='random configurations to check as well')
+    parser.add_argument('--vls', type=int, default=60,
+                        help='VLs of each random configuration')
+    parser.add_argument('-e', '--engines', nargs='+', default=['fused', 'multi'],
+                        help=f'engines to check: {", ".join(ENGINES)} or '
+                        'module:function')
+    parser.add_argument('-a', '--analyses', nargs='+',
+                        choices=[*FA_VARIANTS, *BUFDIM_VARIANTS],
+                        default=[*FA_VARIANTS, 'bd-s'],
+                        help='analysis variants, as for batch.py')
+    parser.add_argument('-l', '--latency', type=float, default=16,
+                        help='switching latency (µs)')
+    parser.add_argument('-t', '--tolerance', type=float, default=1e-9,
+                        help='relative tolerance on delays and backlogs')
+    parser.add_argument('-r', '--repeat', type=int, default=1,
+                        help='runs of each engine, timing the best one')
+    parser.add_argument('-o', '--output', default='-',
+                        help='JSON report file (default: standard output)')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    engines = {name: engine(name) for name in args.engines}
+    report = []
+    for name, load in configurations(args):
+        try:
+            expected, runtime = run(reference, load, args.analyses,
+                                    args.repeat)
+        except ValueError as error:  # Cyclic dependencies
+            report.append({'configuration': name, 'skipped': str(error)})
+            continue
+        result = {'configuration': name, 'runtime': runtime, 'engines': {}}
+        for engine_name, fn in engines.items():
+            results, engine_runtime = run(fn, load, args.analyses, args.repeat)
+            diffs = differences(expected, results, args.tolerance)
+            result['engines'][engine_name] = {
+                'runtime': engine_runtime,
+                'speedup': runtime / engine_runtime,
+                'differences': len(diffs),
+                'first': diffs[:10],
+            }
+        report.append(result)
+
+    summary = {
+        'analyses': args.analyses,
+        'tolerance': args.tolerance,
+        'failed': sum(any(engine['differences']
+                          for engine in result['engines'].values())
+                      for result in report if 'engines' in result),
+        'configurations': report,
+    }
+    if args.output == '-':
+        json.dump(summary, sys.stdout, indent=1)
+    else:
+        with open(args.output, 'w') as f:
+            json.dump(summary, f, indent=1)
+    return 1 if summary['failed'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())